@@ -9,27 +9,43 @@ import aws_cdk as cdk
 from infra.stoic_stack import StoicStack
 
 
-# Create CDK app
-app = cdk.App()
-
-# Create the stack
-StoicStack(
-    app,
-    "DailyStoicStack",
-    env=cdk.Environment(
-        # Use default account and region from AWS CLI config
-        # Or specify explicitly:
-        # account=os.environ.get("CDK_DEFAULT_ACCOUNT"),
-        # region=os.environ.get("CDK_DEFAULT_REGION")
-        region="us-east-1"  # Explicitly set region
-    ),
-    description="Daily Stoic reflection email service - generates and sends philosophical reflections",
-    tags={
-        "Project": "DailyStoicReflection",
-        "ManagedBy": "CDK",
-        "Environment": "Production"
-    }
-)
-
-# Synthesize CloudFormation template
-app.synth()
+STACK_NAME = "DailyStoicStack"
+
+
+def create_app() -> cdk.App:
+    """
+    Create the CDK app with the StoicStack, without synthesizing it.
+
+    Lets tests and tooling import the stack without writing cdk.out.
+
+    Returns:
+        CDK app containing the stack
+    """
+    # Create CDK app
+    app = cdk.App()
+
+    # Create the stack
+    StoicStack(
+        app,
+        STACK_NAME,
+        env=cdk.Environment(
+            # Use default account and region from AWS CLI config
+            # Or specify explicitly:
+            # account=os.environ.get("CDK_DEFAULT_ACCOUNT"),
+            # region=os.environ.get("CDK_DEFAULT_REGION")
+            region="us-east-1"  # Explicitly set region
+        ),
+        description="Daily Stoic reflection email service - generates and sends philosophical reflections",
+        tags={
+            "Project": "DailyStoicReflection",
+            "ManagedBy": "CDK",
+            "Environment": "Production"
+        }
+    )
+
+    return app
+
+
+if __name__ == "__main__":
+    # Synthesize CloudFormation template
+    create_app().synth()
@@ -1,11 +1,11 @@
-# PowerShell script to build Lambda package with Linux dependencies
+# PowerShell script to build Lambda package and dependency layer with Linux dependencies
 Write-Host "Building Lambda package with Linux dependencies..." -ForegroundColor Green
 
 # Get the script's directory and change to it
 $scriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
 Set-Location $scriptDir
 
-# Clean up old build
+# Clean up old build (the dependency layer is reused while requirements are unchanged)
 if (Test-Path "lambda_linux") {
     Remove-Item -Recurse -Force lambda_linux
 }
@@ -13,13 +13,61 @@ if (Test-Path "lambda_linux") {
 # Create build directory
 New-Item -ItemType Directory -Path lambda_linux | Out-Null
 
-# Copy Lambda source code
+# Copy Lambda source code and templates (function package contains only our code)
 Write-Host "Copying Lambda source files..." -ForegroundColor Yellow
 Copy-Item lambda/*.py lambda_linux/
+Copy-Item -Recurse lambda/templates lambda_linux/
 
-# Install dependencies for Linux platform
-Write-Host "Installing dependencies for Linux platform..." -ForegroundColor Yellow
-pip install --platform manylinux2014_x86_64 --target lambda_linux --implementation cp --python-version 3.12 --only-binary=:all: --upgrade -r lambda/requirements.txt
+# Package the quotes database as a Python module so the function imports it
+# instead of fetching and parsing it from S3 on every cold start
+Write-Host "Generating packaged quotes module..." -ForegroundColor Yellow
+python generate_quotes_module.py lambda_linux/quotes_data.py
+
+# Precompile bytecode so cold starts don't compile every module. /var/task is
+# read-only on Lambda, so the runtime can't write .pyc files itself. The
+# bytecode must match the runtime version, so this needs a local Python 3.12.
+$python312 = $null
+$python312Args = @()
+if (Get-Command python3.12 -ErrorAction SilentlyContinue) {
+    $python312 = "python3.12"
+} elseif ((Get-Command py -ErrorAction SilentlyContinue) -and (& py -3.12 --version 2>$null)) {
+    $python312 = "py"
+    $python312Args = @("-3.12")
+}
+
+if ($python312) {
+    Write-Host "Precompiling Lambda bytecode..." -ForegroundColor Yellow
+    & $python312 @python312Args -m compileall -q --invalidation-mode unchecked-hash lambda_linux
+} else {
+    Write-Host "Python 3.12 not found, skipping bytecode precompilation" -ForegroundColor Yellow
+}
+
+# Install dependencies into the layer (Lambda adds /opt/python to sys.path)
+$reqHash = (Get-FileHash -Algorithm SHA256 lambda/requirements.txt).Hash.ToLower()
+$stampFile = "lambda_layer/.requirements.sha256"
+
+if ((Test-Path $stampFile) -and ((Get-Content $stampFile) -eq $reqHash)) {
+    Write-Host "lambda/requirements.txt unchanged, reusing existing lambda_layer/" -ForegroundColor Yellow
+} else {
+    if (Test-Path "lambda_layer") {
+        Remove-Item -Recurse -Force lambda_layer
+    }
+    New-Item -ItemType Directory -Path lambda_layer/python | Out-Null
+
+    # Downloaded wheels are kept in pip's cache so rebuilds don't re-download them
+    $pipCacheDir = if ($env:PIP_CACHE_DIR) { $env:PIP_CACHE_DIR } else { Join-Path $env:LOCALAPPDATA "pip\Cache" }
+    Write-Host "Installing dependencies for Linux platform into lambda_layer/..." -ForegroundColor Yellow
+    pip install --platform manylinux2014_x86_64 --target lambda_layer/python --implementation cp --python-version 3.12 --only-binary=:all: --cache-dir $pipCacheDir --upgrade -r lambda/requirements.txt
+
+    # Lambda's /opt is read-only, so bytecode must be compiled at build time
+    if ($python312) {
+        Write-Host "Precompiling dependency layer bytecode..." -ForegroundColor Yellow
+        & $python312 @python312Args -m compileall -q --invalidation-mode unchecked-hash lambda_layer/python
+    }
+
+    Set-Content -Path $stampFile -Value $reqHash
+}
 
 Write-Host "Lambda package built successfully in lambda_linux/" -ForegroundColor Green
+Write-Host "Dependency layer built successfully in lambda_layer/" -ForegroundColor Green
 Write-Host "You can now deploy with: cdk deploy" -ForegroundColor Cyan
@@ -1,5 +1,5 @@
 #!/bin/bash
-# Bash script to build Lambda package with Linux dependencies
+# Bash script to build Lambda package and dependency layer with Linux dependencies
 
 set -e
 
@@ -9,7 +9,7 @@ echo "Building Lambda package with Linux dependencies..."
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
 
-# Clean up old build
+# Clean up old build (the dependency layer is reused while requirements are unchanged)
 if [ -d "lambda_linux" ]; then
     echo "Removing old lambda_linux directory..."
     rm -rf lambda_linux
@@ -19,24 +19,63 @@ fi
 echo "Creating build directory..."
 mkdir lambda_linux
 
-# Copy Lambda source code
+# Copy Lambda source code and templates (function package contains only our code)
 echo "Copying Lambda source files..."
 cp lambda/*.py lambda_linux/
+cp -r lambda/templates lambda_linux/
 
-# Check if requirements file exists
+# Package the quotes database as a Python module so the function imports it
+# instead of fetching and parsing it from S3 on every cold start
+echo "Generating packaged quotes module..."
+python generate_quotes_module.py lambda_linux/quotes_data.py
+
+# Precompile bytecode so cold starts don't compile every module. /var/task is
+# read-only on Lambda, so the runtime can't write .pyc files itself. The
+# bytecode must match the runtime version, so this needs a local Python 3.12.
+PYTHON312="$(command -v python3.12 || true)"
+if [ -n "$PYTHON312" ]; then
+    echo "Precompiling Lambda bytecode..."
+    "$PYTHON312" -m compileall -q --invalidation-mode unchecked-hash lambda_linux
+else
+    echo "python3.12 not found, skipping bytecode precompilation"
+fi
+
+# Install dependencies into the layer (Lambda adds /opt/python to sys.path)
 if [ -f "lambda/requirements.txt" ]; then
-    echo "Installing dependencies for Linux platform..."
-    pip install \
-        --platform manylinux2014_x86_64 \
-        --target lambda_linux \
-        --implementation cp \
-        --python-version 3.12 \
-        --only-binary=:all: \
-        --upgrade \
-        -r lambda/requirements.txt
+    REQ_HASH="$(python -c "import hashlib, sys; print(hashlib.sha256(open(sys.argv[1], 'rb').read()).hexdigest())" lambda/requirements.txt)"
+    STAMP_FILE="lambda_layer/.requirements.sha256"
+
+    if [ -f "$STAMP_FILE" ] && [ "$(cat "$STAMP_FILE")" = "$REQ_HASH" ]; then
+        echo "lambda/requirements.txt unchanged, reusing existing lambda_layer/"
+    else
+        echo "Removing old lambda_layer directory..."
+        rm -rf lambda_layer
+        mkdir -p lambda_layer/python
+
+        # Downloaded wheels are kept in pip's cache so rebuilds don't re-download them
+        echo "Installing dependencies for Linux platform into lambda_layer/..."
+        pip install \
+            --platform manylinux2014_x86_64 \
+            --target lambda_layer/python \
+            --implementation cp \
+            --python-version 3.12 \
+            --only-binary=:all: \
+            --cache-dir "${PIP_CACHE_DIR:-$HOME/.cache/pip}" \
+            --upgrade \
+            -r lambda/requirements.txt
+
+        # Lambda's /opt is read-only, so bytecode must be compiled at build time
+        if [ -n "$PYTHON312" ]; then
+            echo "Precompiling dependency layer bytecode..."
+            "$PYTHON312" -m compileall -q --invalidation-mode unchecked-hash lambda_layer/python
+        fi
+
+        echo "$REQ_HASH" > "$STAMP_FILE"
+    fi
 else
     echo "No requirements.txt found, skipping dependency installation"
 fi
 
 echo "Lambda package built successfully in lambda_linux/"
+echo "Dependency layer built successfully in lambda_layer/"
 echo "You can now deploy with: cdk deploy"
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Generate the packaged quotes module for the Lambda deployment.
+
+Converts config/stoic_quotes_365_days.json into a Python module holding the
+database as a literal dict, so the Lambda function imports it from its
+(precompiled) package instead of downloading and parsing it from S3.
+
+Usage:
+    python generate_quotes_module.py <output_path>
+"""
+
+import json
+import sys
+from pathlib import Path
+
+
+def generate_quotes_module(quotes_file: Path, output_file: Path) -> int:
+    """
+    Write the quotes database to a Python module as QUOTES.
+
+    Args:
+        quotes_file: Path to the quotes database JSON
+        output_file: Path of the module to write
+
+    Returns:
+        Number of quotes written
+    """
+    with open(quotes_file, 'r', encoding='utf-8') as f:
+        quotes_db = json.load(f)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f'"""Generated from {quotes_file.name} by generate_quotes_module.py. Do not edit."""\n\n')
+        f.write(f"QUOTES = {quotes_db!r}\n")
+
+    return sum(len(entries) for entries in quotes_db.values())
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python generate_quotes_module.py <output_path>")
+        sys.exit(1)
+
+    quotes_file = Path(__file__).parent / 'config' / 'stoic_quotes_365_days.json'
+
+    if not quotes_file.exists():
+        print(f"Error: Quotes file not found at {quotes_file}")
+        sys.exit(1)
+
+    count = generate_quotes_module(quotes_file, Path(sys.argv[1]))
+    print(f"Wrote {count} quotes to {sys.argv[1]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,22 @@ from aws_cdk import (
 from constructs import Construct
 
 
+# SES template the sender Lambda stores the day's email in for bulk sends
+# (must match SES_TEMPLATE_NAME in lambda/handler.py)
+SES_TEMPLATE_NAME = "DailyStoicReflection"
+
+# Responses declared on every API method (all carry the CORS header)
+METHOD_RESPONSES = [
+    apigateway.MethodResponse(
+        status_code=status_code,
+        response_parameters={
+            "method.response.header.Access-Control-Allow-Origin": True
+        }
+    )
+    for status_code in ("200", "400", "404", "500")
+]
+
+
 class StoicStack(Stack):
     """CDK Stack for Daily Stoic Reflection email service."""
 
@@ -41,7 +57,25 @@ class StoicStack(Stack):
             encryption=s3.BucketEncryption.S3_MANAGED,
             block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
             removal_policy=RemovalPolicy.RETAIN,  # Keep bucket if stack is deleted
-            auto_delete_objects=False  # Don't auto-delete on stack deletion
+            auto_delete_objects=False,  # Don't auto-delete on stack deletion
+            lifecycle_rules=[
+                # Cached API responses are only useful for retries and reruns
+                s3.LifecycleRule(
+                    prefix="cache/",
+                    expiration=Duration.days(30),
+                    noncurrent_version_expiration=Duration.days(1)
+                )
+            ]
+        )
+
+        # ===== Dependency Layer =====
+        # Third-party packages ship as a layer so the function packages hold
+        # only our source and download quickly on cold start
+        deps_layer = lambda_.LayerVersion(
+            self, "PythonDeps",
+            code=lambda_.Code.from_asset("lambda_layer"),
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_12],
+            description="Third-party dependencies for the Daily Stoic Lambda functions"
         )
 
         # ===== Lambda Function =====
@@ -51,30 +85,66 @@ class StoicStack(Stack):
             runtime=lambda_.Runtime.PYTHON_3_12,
             handler="handler.lambda_handler",
             code=lambda_.Code.from_asset("lambda_linux"),
+            layers=[deps_layer],
             timeout=Duration.seconds(60),
-            memory_size=256,
+            memory_size=512,
             environment={
                 "BUCKET_NAME": bucket.bucket_name,
                 "SENDER_EMAIL": sender_email or "reflections@jamescmooney.com",
                 "ANTHROPIC_API_KEY": anthropic_api_key or "MISSING_API_KEY",
             },
             log_retention=logs.RetentionDays.ONE_WEEK,
-            description="Generates and sends daily stoic reflections via email"
+            description="Generates and sends daily stoic reflections via email",
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS
+        )
+
+        # SnapStart only applies to published versions, so invoke through an alias
+        lambda_alias = lambda_.Alias(
+            self, "SenderLive",
+            alias_name="live",
+            version=lambda_fn.current_version
         )
 
         # Grant Lambda permissions to read/write S3 bucket
         bucket.grant_read_write(lambda_fn)
 
+        # Function creates its own role when none is passed in
+        assert lambda_fn.role is not None
+
         # Grant Lambda permissions to send emails via SES
-        lambda_fn.add_to_role_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "ses:SendEmail",
-                    "ses:SendRawEmail"
-                ],
-                resources=["*"]  # SES doesn't support resource-level permissions for these actions
-            )
+        # (managed policy keeps SES access out of the role's inline policy
+        # and can be attached to any future sender Lambdas)
+        iam.ManagedPolicy(
+            self,
+            "SesSendPolicy",
+            statements=[
+                iam.PolicyStatement(
+                    effect=iam.Effect.ALLOW,
+                    actions=[
+                        "ses:SendEmail",
+                        "ses:SendRawEmail",
+                        "ses:SendBulkTemplatedEmail"
+                    ],
+                    resources=["*"]  # Sender identities are verified outside this stack
+                ),
+                # Bulk sends store the day's email as an SES template; only that
+                # template may be created or updated
+                iam.PolicyStatement(
+                    effect=iam.Effect.ALLOW,
+                    actions=[
+                        "ses:CreateTemplate",
+                        "ses:UpdateTemplate"
+                    ],
+                    resources=[
+                        self.format_arn(
+                            service="ses",
+                            resource="template",
+                            resource_name=SES_TEMPLATE_NAME
+                        )
+                    ]
+                )
+            ],
+            roles=[lambda_fn.role]
         )
 
         # ===== EventBridge Rule (Daily Trigger) =====
@@ -99,7 +169,7 @@ class StoicStack(Stack):
         )
 
         # Add Lambda as target
-        rule.add_target(targets.LambdaFunction(lambda_fn))
+        rule.add_target(targets.LambdaFunction(lambda_alias))
 
         # ===== API Lambda Function =====
         api_lambda_fn = lambda_.Function(
@@ -108,6 +178,7 @@ class StoicStack(Stack):
             runtime=lambda_.Runtime.PYTHON_3_12,
             handler="api_handler.lambda_handler",
             code=lambda_.Code.from_asset("lambda_linux"),
+            layers=[deps_layer],
             timeout=Duration.seconds(10),
             memory_size=128,
             environment={
@@ -117,10 +188,26 @@ class StoicStack(Stack):
             description="API handler for serving daily stoic reflections"
         )
 
+        # Keep a warm instance behind the published alias that API Gateway invokes.
+        # Provisioned concurrency and SnapStart are mutually exclusive, so the
+        # API function relies on provisioned concurrency alone.
+        api_lambda_alias = lambda_.Alias(
+            self, "ApiLive",
+            alias_name="live",
+            version=api_lambda_fn.current_version,
+            provisioned_concurrent_executions=1
+        )
+
+        # Scale provisioned concurrency with demand (1-5 warm instances)
+        api_scaling = api_lambda_alias.add_auto_scaling(min_capacity=1, max_capacity=5)
+        api_scaling.scale_on_utilization(utilization_target=0.7)
+
         # Grant API Lambda read-only access to S3 bucket
         bucket.grant_read(api_lambda_fn)
 
         # ===== API Gateway =====
+        # REST API (v1) rather than HTTP API (v2): HTTP APIs have no stage response
+        # cache, and serving repeats from the cache skips the Lambda entirely
         api = apigateway.RestApi(
             self, "ReflectionApi",
             rest_api_name="Morning Reflections API",
@@ -131,7 +218,19 @@ class StoicStack(Stack):
                 throttling_rate_limit=5,    # Requests per second
                 logging_level=apigateway.MethodLoggingLevel.INFO,
                 data_trace_enabled=True,
-                metrics_enabled=True
+                metrics_enabled=True,
+                # Reflections change once a day, so serve repeats from the stage cache
+                caching_enabled=True,
+                cache_cluster_enabled=True,
+                cache_cluster_size="0.5",
+                cache_ttl=Duration.minutes(5),
+                # Past dates never change; one hour is the API Gateway maximum TTL
+                method_options={
+                    "/reflection/{date}/GET": apigateway.MethodDeploymentOptions(
+                        caching_enabled=True,
+                        cache_ttl=Duration.hours(1)
+                    )
+                }
             ),
             default_cors_preflight_options=apigateway.CorsOptions(
                 allow_origins=["*"],
@@ -142,9 +241,23 @@ class StoicStack(Stack):
             endpoint_types=[apigateway.EndpointType.REGIONAL]
         )
 
+        # Errors generated by API Gateway itself (unknown routes, throttling)
+        # never reach the Lambda; give them CORS headers so browsers can read them
+        for response_id, response_type in (
+            ("Default4xx", apigateway.ResponseType.DEFAULT_4_XX),
+            ("Default5xx", apigateway.ResponseType.DEFAULT_5_XX),
+        ):
+            api.add_gateway_response(
+                response_id,
+                type=response_type,
+                response_headers={
+                    "Access-Control-Allow-Origin": "'*'"
+                }
+            )
+
         # Create Lambda integration
         api_integration = apigateway.LambdaIntegration(
-            api_lambda_fn,
+            api_lambda_alias,
             proxy=True,
             integration_responses=[
                 apigateway.IntegrationResponse(
@@ -164,29 +277,37 @@ class StoicStack(Stack):
         today_resource.add_method(
             "GET",
             api_integration,
-            method_responses=[
-                apigateway.MethodResponse(
+            method_responses=METHOD_RESPONSES
+        )
+
+        # Add /reflection/{date} endpoint
+        # The date path parameter is part of the cache key so each date is cached
+        # separately
+        date_integration = apigateway.LambdaIntegration(
+            api_lambda_alias,
+            proxy=True,
+            cache_key_parameters=["method.request.path.date"],
+            request_parameters={
+                "integration.request.path.date": "method.request.path.date"
+            },
+            integration_responses=[
+                apigateway.IntegrationResponse(
                     status_code="200",
                     response_parameters={
-                        "method.response.header.Access-Control-Allow-Origin": True
+                        "method.response.header.Access-Control-Allow-Origin": "'*'"
                     }
                 )
             ]
         )
 
-        # Add /reflection/{date} endpoint
         date_resource = reflection_resource.add_resource("{date}")
         date_resource.add_method(
             "GET",
-            api_integration,
-            method_responses=[
-                apigateway.MethodResponse(
-                    status_code="200",
-                    response_parameters={
-                        "method.response.header.Access-Control-Allow-Origin": True
-                    }
-                )
-            ]
+            date_integration,
+            request_parameters={
+                "method.request.path.date": True
+            },
+            method_responses=METHOD_RESPONSES
         )
 
         # ===== CloudFormation Outputs =====
@@ -241,7 +362,10 @@ class StoicStack(Stack):
 
         # Store references for potential use
         self.bucket = bucket
+        self.deps_layer = deps_layer
         self.lambda_function = lambda_fn
+        self.lambda_alias = lambda_alias
         self.event_rule = rule
         self.api_lambda_function = api_lambda_fn
+        self.api_lambda_alias = api_lambda_alias
         self.api = api
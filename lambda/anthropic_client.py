@@ -6,47 +6,99 @@ Handles prompt construction, API calls to Claude, and response parsing.
 
 import json
 import logging
-import re
-from typing import Dict, List, Optional
-from anthropic import Anthropic
+import os
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from string import Template
+from typing import Any
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+import urllib3
 
+import json_utils
+from quote_tracker import QuoteEntry
+from reflection_cache import ReflectionCache
 
-def build_reflection_prompt(
-    quote: str,
-    attribution: str,
-    theme: str,
-    previous_reflections: Optional[List[Dict[str, str]]] = None
-) -> str:
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+# Anthropic Messages API (called directly; urllib3 ships with the Lambda runtime)
+ANTHROPIC_API_URL = "https://api.anthropic.com/v1"
+ANTHROPIC_VERSION = "2023-06-01"
+MODEL = "claude-sonnet-4-5-20250929"
+
+# Authors accepted by validate_attribution_format, matched as substrings of the
+# credited author in this order
+_KNOWN_AUTHORS = (
+    'Marcus Aurelius',
+    'Epictetus',
+    'Seneca',
+    'Musonius Rufus'
+)
+
+# Connection pool reused across warm invocations (keeps the HTTPS connection alive).
+# Retries mirror the SDK defaults: rate limits, overloads, and transient 5xx errors.
+# Requests that must not be repeated (batch creation) pass retries=False.
+_HTTP = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=4,
+    timeout=urllib3.Timeout(connect=3.0, read=25.0),
+    retries=urllib3.Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504, 529),
+        allowed_methods=None,
+        raise_on_status=False
+    )
+)
+
+
+def _api_headers(api_key: str) -> dict[str, str]:
     """
-    Build the prompt for Claude to generate a reflection based on a provided quote.
+    Build the request headers for the Anthropic API.
 
     Args:
-        quote: The stoic quote to reflect upon
-        attribution: The quote's attribution (e.g., "Marcus Aurelius - Meditations 5.1")
-        theme: Monthly theme (e.g., "Discipline and Self-Improvement")
-        previous_reflections: List of previous quotes and reflections from this month
-                             Each dict should have: date, quote, attribution, reflection
+        api_key: Anthropic API key
 
     Returns:
-        Formatted prompt string
+        Header dictionary
     """
-    # Build context section from previous reflections if available
-    context_section = ""
-    if previous_reflections and len(previous_reflections) > 0:
-        context_section = "\n\nPrevious quotes and reflections from this month:\n\n"
-        for entry in previous_reflections:
-            context_section += f"""Date: {entry.get('date', 'Unknown')}
-Quote: "{entry.get('quote', '')}"
-Attribution: {entry.get('attribution', '')}
-Reflection: {entry.get('reflection', '')}
+    return {
+        "x-api-key": api_key,
+        "anthropic-version": ANTHROPIC_VERSION,
+        "content-type": "application/json"
+    }
 
----
 
-"""
-        context_section += """These are examples of reflections already provided to the user this month. Your new reflection should build on this foundation by:
+def warm_connection(api_key: str) -> None:
+    """
+    Open the pooled HTTPS connection to the Anthropic API ahead of the first request.
+
+    Issues a free model-list request so the TCP/TLS handshake is done before the
+    Messages call. Safe to run in a background thread; failures are logged and
+    never raised.
+
+    Args:
+        api_key: Anthropic API key
+    """
+    try:
+        _HTTP.request(
+            "GET",
+            f"{ANTHROPIC_API_URL}/models?limit=1",
+            headers=_api_headers(api_key),
+            timeout=urllib3.Timeout(connect=3.0, read=5.0),
+            retries=False
+        )
+        logger.info("Warmed Anthropic API connection")
+    except Exception as e:
+        logger.warning(f"Failed to warm Anthropic API connection: {e}")
+
+
+# Prompt templates, parsed once at import time
+_CONTEXT_HEADER = "Previous quotes and reflections from this month:\n\n"
+
+
+_CONTEXT_FOOTER = """These are examples of reflections already provided to the user this month. Your new reflection should build on this foundation by:
 - Exploring different aspects of stoic philosophy (virtue, dichotomy of control, negative visualization, memento mori, amor fati, etc.)
 - Varying the philosophical angle or school of thought when possible
 - Introducing fresh perspectives the user may not have considered
@@ -56,19 +108,18 @@ Use this memory to ensure the user experiences a rich, diverse exploration of ho
 
 """
 
-    prompt = f"""You are a thoughtful teacher of stoic philosophy. Your task is to write a daily reflection for someone navigating the complexities of modern life in 2025. You must not use the first person pronouns "I" or "me" in your reflection.
-{context_section}
-You have been given this stoic quote to reflect upon:
-
-"{quote}"
-— {attribution}
+# Instructions that never change between days, sent as the system prompt.
+# Not marked for prompt caching: at roughly 700 tokens it is below the
+# model's 1024-token minimum for a cacheable prefix, so a cache_control
+# marker would have no effect.
+SYSTEM_PROMPT = """You are a thoughtful teacher of stoic philosophy. Your task is to write a daily reflection for someone navigating the complexities of modern life in 2025. You must not use the first person pronouns "I" or "me" in your reflection.
 
-Current Month's Theme: {theme}
+Each request gives you a stoic quote, its attribution, and the current month's theme, and may include the reflections already written this month.
 
 Write a reflection (150-250 words) that bridges ancient wisdom with contemporary challenges:
 
 THEMATIC FOUNDATION:
-- This month's theme ({theme}) is your central organizing principle
+- This month's theme (given with each quote) is your central organizing principle
 - Every reflection must clearly connect to and deepen the reader's understanding of this theme
 - Show how the quote illuminates a specific aspect or dimension of the monthly theme
 - Help readers build a cohesive understanding of the theme throughout the month
@@ -101,25 +152,203 @@ Your reflection should be organized into three distinct sections:
 3. DAILY PRACTICE (50-60 words): Offer a specific micro-practice the reader can apply TODAY. Be concrete and actionable - not generic advice. Examples: "Before your next meeting, take 30 seconds to..." or "Tonight, write down three things..." Give them a clear, simple action they can take within the next 24 hours.
 
 Format your response as JSON:
-{{
+{
   "understanding": "Your explanation of the quote's meaning (40-60 words)",
   "connection": "How this applies to 2025 challenges with concrete examples (60-80 words)",
   "practice": "A specific micro-practice for today (50-60 words)"
-}}
+}"""
+
+_REFLECTION_PROMPT_TEMPLATE = Template("""${context_section}You have been given this stoic quote to reflect upon:
+
+"${quote}"
+— ${attribution}
+
+Current Month's Theme: ${theme}
+
+Write the reflection now.""")
+
+
+def build_reflection_prompt(
+    quote: str,
+    attribution: str,
+    theme: str,
+    previous_reflections: Sequence[QuoteEntry] | None = None
+) -> str:
+    """
+    Build the prompt for Claude to generate a reflection based on a provided quote.
+
+    Only the per-day content (quote, theme, this month's reflections) goes here;
+    the standing instructions are sent separately as SYSTEM_PROMPT.
+
+    Args:
+        quote: The stoic quote to reflect upon
+        attribution: The quote's attribution (e.g., "Marcus Aurelius - Meditations 5.1")
+        theme: Monthly theme (e.g., "Discipline and Self-Improvement")
+        previous_reflections: Previous quote history entries from this month
+                             (date, quote, attribution, reflection are used)
 
-Write the reflection now."""
+    Returns:
+        Formatted prompt string
+    """
+    # Build context section from previous reflections if available
+    context_section = ""
+    if previous_reflections:
+        parts = [_CONTEXT_HEADER]
+        parts.extend(
+            f"Date: {entry.get('date', 'Unknown')}\n"
+            f"Quote: \"{entry.get('quote', '')}\"\n"
+            f"Attribution: {entry.get('attribution', '')}\n"
+            f"Reflection: {entry.get('reflection', '')}\n"
+            "\n---\n\n"
+            for entry in previous_reflections
+        )
+        parts.append(_CONTEXT_FOOTER)
+        context_section = "".join(parts)
 
-    return prompt
+    return _REFLECTION_PROMPT_TEMPLATE.substitute(
+        context_section=context_section,
+        quote=quote,
+        attribution=attribution,
+        theme=theme
+    )
 
 
-def call_anthropic_api(prompt: str, api_key: str, timeout: int = 25) -> Dict[str, str]:
+def _message_params(prompt: str) -> dict[str, Any]:
+    """
+    Build the Messages API parameters for a reflection prompt.
+
+    Args:
+        prompt: The formatted user prompt
+
+    Returns:
+        Request parameters (model, limits, system prompt, messages)
+    """
+    return {
+        "model": MODEL,
+        "max_tokens": 2000,
+        "temperature": 1.0,
+        "system": SYSTEM_PROMPT,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    }
+
+
+def _sse_line_text(line: bytes) -> Iterator[str]:
+    """
+    Yield the text delta, if any, carried by one server-sent event line.
+
+    Args:
+        line: A single line of the event stream, without its newline
+
+    Yields:
+        The line's text fragment, for content_block_delta text events
+
+    Raises:
+        Exception: If the line is an error event
+    """
+    # Only "data:" lines carry payloads; "event:" names repeat the type
+    if not line.startswith(b"data:"):
+        return
+
+    event = json_utils.loads(line[5:])
+    event_type = event.get("type")
+
+    if event_type == "content_block_delta":
+        delta = event["delta"]
+        if delta.get("type") == "text_delta":
+            yield delta["text"]
+    elif event_type == "message_delta":
+        stop_reason = event.get("delta", {}).get("stop_reason")
+        if stop_reason == "max_tokens":
+            logger.warning("Anthropic response stopped at max_tokens")
+    elif event_type == "error":
+        raise Exception(f"Anthropic API stream error: {event.get('error')}")
+
+
+def _iter_sse_text(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yield the text deltas from a Messages API server-sent event stream.
+
+    Args:
+        chunks: Raw byte chunks of the event stream, in order
+
+    Yields:
+        Text fragments of the response as they arrive
+
+    Raises:
+        Exception: If the stream reports an error event
+    """
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            yield from _sse_line_text(line)
+
+    # A stream cut off at EOF can end without a trailing newline, so the last
+    # line is still in the buffer. If it was cut mid-event it can't be parsed.
+    if buffer:
+        try:
+            yield from _sse_line_text(buffer)
+        except json.JSONDecodeError:
+            logger.warning("Discarding incomplete final event in Anthropic API stream")
+
+
+def stream_anthropic_api(prompt: str, api_key: str, timeout: int = 25) -> Iterator[str]:
+    """
+    Stream a reflection from the Anthropic API as it is generated.
+
+    The read timeout applies between chunks rather than to the whole
+    completion, so long generations don't time out while tokens are flowing.
+
+    Args:
+        prompt: The formatted prompt
+        api_key: Anthropic API key
+        timeout: Max seconds to wait for each chunk of the response (default: 25)
+
+    Yields:
+        Text fragments of Claude's response
+
+    Raises:
+        Exception: If the API call fails or the stream reports an error
+    """
+    body = json_utils.dumps_bytes({**_message_params(prompt), "stream": True})
+
+    response = _HTTP.request(
+        "POST",
+        f"{ANTHROPIC_API_URL}/messages",
+        headers=_api_headers(api_key),
+        body=body,
+        timeout=urllib3.Timeout(connect=3.0, read=timeout),
+        preload_content=False
+    )
+
+    try:
+        if response.status != 200:
+            raise Exception(
+                f"Anthropic API returned HTTP {response.status}: "
+                f"{response.data[:500].decode('utf-8', 'replace')}"
+            )
+
+        yield from _iter_sse_text(response.stream(4096))
+
+    finally:
+        response.release_conn()
+
+
+def call_anthropic_api(prompt: str, api_key: str, timeout: int = 25) -> dict[str, str]:
     """
     Call the Anthropic API to generate a stoic reflection.
 
     Args:
         prompt: The formatted prompt
         api_key: Anthropic API key
-        timeout: API call timeout in seconds (default: 25)
+        timeout: Max seconds to wait for each chunk of the response (default: 25)
 
     Returns:
         Dictionary with keys: understanding, connection, practice
@@ -128,27 +357,12 @@ def call_anthropic_api(prompt: str, api_key: str, timeout: int = 25) -> Dict[str
         Exception: If API call fails or response is invalid
     """
     try:
-        client = Anthropic(api_key=api_key)
-
         logger.info("Calling Anthropic API to generate reflection")
 
-        response = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2000,
-            temperature=1.0,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            timeout=timeout
-        )
-
-        # Extract text from response
-        response_text = response.content[0].text
+        # Collect the streamed response text
+        response_text = "".join(stream_anthropic_api(prompt, api_key, timeout))
 
-        logger.info(f"Received response from Anthropic API ({len(response_text)} chars)")
+        logger.info("Received response from Anthropic API (%d chars)", len(response_text))
 
         # Parse the response
         reflection = parse_reflection_response(response_text)
@@ -160,7 +374,47 @@ def call_anthropic_api(prompt: str, api_key: str, timeout: int = 25) -> Dict[str
         raise
 
 
-def parse_reflection_response(response_text: str) -> Dict[str, str]:
+def _extract_json_object(text: str, start: int) -> str:
+    """
+    Return the JSON object that opens at text[start], matched by brace depth.
+
+    Braces inside string literals (including escaped quotes) are ignored. If the
+    object is never closed, the rest of the text is returned and left for the
+    JSON parser to reject.
+
+    Args:
+        text: Text containing a JSON object
+        start: Index of the object's opening brace
+
+    Returns:
+        The JSON object substring
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return text[start:]
+
+
+def parse_reflection_response(response_text: str) -> dict[str, str]:
     """
     Parse Claude's response and extract the structured reflection.
 
@@ -176,23 +430,24 @@ def parse_reflection_response(response_text: str) -> Dict[str, str]:
         ValueError: If response is invalid or missing required fields
     """
     try:
-        # Try to extract JSON from markdown code blocks first
-        json_match = re.search(
-            r'```(?:json)?\s*(\{.*?\})\s*```',
-            response_text,
-            re.DOTALL
-        )
+        json_str = response_text.strip()
 
-        if json_match:
-            json_str = json_match.group(1)
-            logger.info("Found JSON in markdown code block")
-        else:
-            # Try to parse the entire response as JSON
-            json_str = response_text.strip()
+        if json_str.startswith("{") and json_str.endswith("}"):
+            # Fast path: the response is the raw JSON object
             logger.info("Attempting to parse response as raw JSON")
+        else:
+            # JSON wrapped in a markdown code block (or followed by extra text):
+            # take the first complete object after the fence
+            fence = json_str.find("```")
+            start = json_str.find("{", max(fence, 0))
+            if start != -1:
+                json_str = _extract_json_object(json_str, start)
+                logger.info("Extracted JSON object from surrounding text")
+            else:
+                logger.info("Attempting to parse response as raw JSON")
 
         # Parse JSON
-        data = json.loads(json_str)
+        data = json_utils.loads(json_str)
 
         # Validate required fields
         required_fields = ['understanding', 'connection', 'practice']
@@ -203,11 +458,9 @@ def parse_reflection_response(response_text: str) -> Dict[str, str]:
                 raise ValueError(f"Invalid value for field: {field}")
 
         logger.info("Successfully parsed Anthropic response")
-        total_length = sum(len(data[field]) for field in required_fields)
-        logger.info(f"Total reflection length: {total_length} characters")
-        logger.info(f"Understanding: {len(data['understanding'])} chars, "
-                   f"Connection: {len(data['connection'])} chars, "
-                   f"Practice: {len(data['practice'])} chars")
+        logger.debug("Reflection lengths: understanding=%d connection=%d practice=%d",
+                     len(data['understanding']), len(data['connection']),
+                     len(data['practice']))
 
         return {
             'understanding': data['understanding'].strip(),
@@ -225,6 +478,7 @@ def parse_reflection_response(response_text: str) -> Dict[str, str]:
         raise
 
 
+@lru_cache(maxsize=256)
 def validate_attribution_format(attribution: str) -> bool:
     """
     Validate that attribution follows expected format.
@@ -238,23 +492,13 @@ def validate_attribution_format(attribution: str) -> bool:
         True if valid format, False otherwise
     """
     # Should contain author name and work separated by dash
-    if ' - ' not in attribution:
+    author, separator, _ = attribution.partition(' - ')
+    if not separator:
         return False
 
-    parts = attribution.split(' - ')
-    if len(parts) < 2:
-        return False
-
-    # Check for known authors
-    known_authors = [
-        'Marcus Aurelius',
-        'Epictetus',
-        'Seneca',
-        'Musonius Rufus'
-    ]
-
-    author = parts[0].strip()
-    return any(known in author for known in known_authors)
+    # Check for known authors, either exactly or within a longer credit
+    # (e.g. "Attributed to Plato, cited by Marcus Aurelius")
+    return any(known in author for known in _KNOWN_AUTHORS)
 
 
 def generate_reflection_only(
@@ -262,8 +506,9 @@ def generate_reflection_only(
     attribution: str,
     theme: str,
     api_key: str,
-    previous_reflections: Optional[List[Dict[str, str]]] = None
-) -> Optional[Dict[str, str]]:
+    previous_reflections: Sequence[QuoteEntry] | None = None,
+    cache: ReflectionCache | None = None
+) -> dict[str, str] | None:
     """
     Generate a reflection based on a provided quote.
 
@@ -272,7 +517,8 @@ def generate_reflection_only(
         attribution: The quote's attribution (e.g., "Marcus Aurelius - Meditations 5.1")
         theme: Monthly theme name
         api_key: Anthropic API key
-        previous_reflections: List of previous quotes and reflections from this month
+        previous_reflections: Previous quote history entries from this month
+        cache: Optional cache consulted before (and filled after) the API call
 
     Returns:
         Dictionary with keys: understanding, connection, practice, or None if generation fails
@@ -286,10 +532,142 @@ def generate_reflection_only(
             # Don't fail, just log warning
 
         prompt = build_reflection_prompt(quote, attribution, theme, previous_reflections)
+
+        if cache is None:
+            return call_anthropic_api(prompt, api_key)
+
+        # Identical requests (retries, reruns) reuse the stored reflection
+        cache_key = cache.make_key(MODEL, SYSTEM_PROMPT, prompt)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         reflection = call_anthropic_api(prompt, api_key)
+        cache.put(cache_key, reflection)
 
         return reflection
 
     except Exception as e:
         logger.error(f"Failed to generate reflection: {e}")
         return None
+
+
+def _parse_batch_results(lines: Iterable[bytes], count: int) -> list[dict[str, str] | None]:
+    """
+    Parse Message Batches results into reflections ordered by request index.
+
+    Args:
+        lines: JSONL result lines; custom_id is the request's index
+        count: Number of requests in the batch
+
+    Returns:
+        List with a reflection per request, or None where that request failed
+    """
+    reflections: list[dict[str, str] | None] = [None] * count
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        entry = json_utils.loads(line)
+        index = int(entry['custom_id'])
+        result = entry['result']
+
+        if result['type'] != 'succeeded':
+            logger.error(f"Batch request {index} {result['type']}: {result.get('error')}")
+            continue
+
+        try:
+            reflections[index] = parse_reflection_response(
+                result['message']['content'][0]['text']
+            )
+        except Exception as e:
+            logger.error(f"Failed to parse batch result {index}: {e}")
+
+    return reflections
+
+
+def generate_reflections_batch(
+    items: list[dict[str, Any]],
+    api_key: str,
+    poll_interval: float = 30.0,
+    max_wait: float = 3600.0
+) -> list[dict[str, str] | None]:
+    """
+    Generate many reflections in one Message Batches request (e.g. for backfills).
+
+    Batches are billed at half the normal rate but complete asynchronously, so
+    this polls until the batch ends. Not meant for the daily Lambda.
+
+    Args:
+        items: Dicts with keys quote, attribution, theme and optionally
+               previous_reflections (a Sequence[QuoteEntry], as for
+               generate_reflection_only)
+        api_key: Anthropic API key
+        poll_interval: Seconds between status checks (default: 30)
+        max_wait: Seconds to wait for the batch before giving up (default: 3600)
+
+    Returns:
+        List with a reflection per item (in order), or None where generation failed
+
+    Raises:
+        Exception: If the batch can't be created or its status can't be read
+        TimeoutError: If the batch hasn't ended within max_wait
+    """
+    if not items:
+        return []
+
+    requests = [
+        {
+            "custom_id": str(index),
+            "params": _message_params(build_reflection_prompt(
+                item['quote'],
+                item['attribution'],
+                item['theme'],
+                item.get('previous_reflections')
+            ))
+        }
+        for index, item in enumerate(items)
+    ]
+
+    headers = _api_headers(api_key)
+    # Not retried: creating a batch isn't idempotent, and a retry after a
+    # response was lost could create (and bill) a duplicate batch
+    response = _HTTP.request(
+        "POST",
+        f"{ANTHROPIC_API_URL}/messages/batches",
+        headers=headers,
+        body=json_utils.dumps_bytes({"requests": requests}),
+        retries=False
+    )
+    if response.status != 200:
+        raise Exception(
+            f"Failed to create message batch (HTTP {response.status}): "
+            f"{response.data[:500].decode('utf-8', 'replace')}"
+        )
+
+    batch = json_utils.loads(response.data)
+    logger.info(f"Created message batch {batch['id']} with {len(requests)} requests")
+
+    deadline = time.monotonic() + max_wait
+    while batch['processing_status'] != 'ended':
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Message batch {batch['id']} did not finish within {max_wait}s")
+
+        time.sleep(poll_interval)
+        response = _HTTP.request(
+            "GET",
+            f"{ANTHROPIC_API_URL}/messages/batches/{batch['id']}",
+            headers=headers
+        )
+        if response.status != 200:
+            raise Exception(f"Failed to read message batch status (HTTP {response.status})")
+        batch = json_utils.loads(response.data)
+
+    logger.info(f"Message batch {batch['id']} ended: {batch.get('request_counts')}")
+
+    response = _HTTP.request("GET", batch['results_url'], headers=headers)
+    if response.status != 200:
+        raise Exception(f"Failed to download message batch results (HTTP {response.status})")
+
+    return _parse_batch_results(response.data.splitlines(), len(items))
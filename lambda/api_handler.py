@@ -5,62 +5,143 @@ This handler provides a read-only API to access pre-generated daily reflections
 from the quote history stored in S3.
 """
 
-import json
+import functools
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
+from datetime import date, datetime
+from typing import Any
+import boto3
+import json_utils
 from quote_tracker import QuoteTracker
 from themes import get_monthly_theme
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
+# Date index of the quote history, cached across warm invocations:
+# {bucket_name: (checked_at, etag, {date: entry})}. After the TTL the S3 ETag is
+# rechecked and the history is only downloaded again if it changed.
+HISTORY_CACHE_TTL_SECONDS = 300
+_HISTORY_CACHE: dict[str, tuple[float, str | None, dict[str, dict[str, Any]]]] = {}
 
-def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+# Client cache lifetimes (Cache-Control max-age). Today's entry appears once the
+# daily sender runs; past dates never change.
+TODAY_CACHE_SECONDS = 300
+DATE_CACHE_SECONDS = 3600
+
+
+@functools.cache
+def get_s3_client() -> Any:
+    """
+    Get the shared S3 client, creating it on first use.
+
+    Returns:
+        boto3 S3 client
     """
-    Create an API Gateway response with CORS headers.
+    return boto3.client('s3')
+
+
+def create_response(
+    status_code: int,
+    body: dict[str, Any],
+    cache_seconds: int = 0
+) -> dict[str, Any]:
+    """
+    Create an API Gateway response with CORS and caching headers.
 
     Args:
         status_code: HTTP status code
         body: Response body dictionary
+        cache_seconds: How long clients may cache the response (0 = don't cache)
 
     Returns:
         API Gateway response dictionary
     """
+    if cache_seconds > 0:
+        cache_control = f'public, max-age={cache_seconds}'
+    else:
+        cache_control = 'no-store'
+
     return {
         'statusCode': status_code,
         'headers': {
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type'
+            'Access-Control-Allow-Headers': 'Content-Type',
+            'Cache-Control': cache_control
         },
-        'body': json.dumps(body)
+        'body': json_utils.dumps(body)
     }
 
 
+def build_history_index(history: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Index history entries by date.
+
+    If a date appears more than once, the earliest entry in the file wins.
+
+    Args:
+        history: Quote history dictionary from S3
+
+    Returns:
+        Dictionary mapping ISO date strings (YYYY-MM-DD) to quote entries
+    """
+    return {entry.get('date'): entry for entry in reversed(history.get('quotes', []))}
+
+
+def load_history_index(bucket_name: str) -> dict[str, dict[str, Any]]:
+    """
+    Load the date index of the quote history, reusing a copy cached by this container.
+
+    Within HISTORY_CACHE_TTL_SECONDS the cached index is used as-is. After that
+    the history's ETag is checked with a HEAD request, and the history is only
+    downloaded and re-indexed if it changed.
+
+    Args:
+        bucket_name: S3 bucket containing the quote history
+
+    Returns:
+        Dictionary mapping ISO date strings to quote entries
+    """
+    now = time.monotonic()
+    cached = _HISTORY_CACHE.get(bucket_name)
+    if cached is not None and now - cached[0] < HISTORY_CACHE_TTL_SECONDS:
+        return cached[2]
+
+    tracker = QuoteTracker(bucket_name, s3_client=get_s3_client())
+    etag = tracker.get_history_etag()
+
+    if cached is not None and etag is not None and etag == cached[1]:
+        index = cached[2]
+    else:
+        history = tracker.load_history()
+        index = build_history_index(history)
+        logger.info(f"Loaded history with {len(history['quotes'])} quotes")
+
+    _HISTORY_CACHE[bucket_name] = (now, etag, index)
+    return index
+
+
 def find_reflection_by_date(
-    history: Dict[str, Any],
+    history_index: dict[str, dict[str, Any]],
     target_date: str
-) -> Optional[Dict[str, Any]]:
+) -> dict[str, Any] | None:
     """
-    Find a reflection entry by date in the history.
+    Find a reflection entry by date.
 
     Args:
-        history: Quote history dictionary from S3
+        history_index: Date index from build_history_index()
         target_date: ISO format date string (YYYY-MM-DD)
 
     Returns:
         Quote entry dictionary if found, None otherwise
     """
-    for quote_entry in history.get('quotes', []):
-        if quote_entry.get('date') == target_date:
-            return quote_entry
-    return None
+    return history_index.get(target_date)
 
 
-def format_reflection_response(quote_entry: Dict[str, Any]) -> Dict[str, Any]:
+def format_reflection_response(quote_entry: dict[str, Any]) -> dict[str, Any]:
     """
     Format a quote entry into the API response format.
 
@@ -72,8 +153,7 @@ def format_reflection_response(quote_entry: Dict[str, Any]) -> Dict[str, Any]:
     """
     # Extract date and get monthly theme
     date_str = quote_entry['date']
-    date_obj = datetime.fromisoformat(date_str)
-    monthly_theme = get_monthly_theme(date_obj.month)
+    monthly_theme = get_monthly_theme(int(date_str[5:7]))  # YYYY-MM-DD
 
     return {
         'date': date_str,
@@ -88,7 +168,7 @@ def format_reflection_response(quote_entry: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     Lambda handler for the Morning Reflections API.
 
@@ -122,11 +202,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'error': 'Server configuration error'
             })
 
-        # Initialize tracker and load history
-        tracker = QuoteTracker(bucket_name)
-        history = tracker.load_history()
-
-        logger.info(f"Loaded history with {len(history.get('quotes', []))} quotes")
+        # Load the history's date index (cached across warm invocations)
+        history_index = load_history_index(bucket_name)
 
         # Parse the path to determine the requested date
         path_parts = path.strip('/').split('/')
@@ -138,13 +215,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             if path_parts[1] == 'today':
                 # /reflection/today
                 target_date = datetime.now().strftime('%Y-%m-%d')
+                cache_seconds = TODAY_CACHE_SECONDS
             else:
                 # /reflection/{date}
                 target_date = path_parts[1]
+                cache_seconds = DATE_CACHE_SECONDS
 
                 # Validate date format
                 try:
-                    datetime.strptime(target_date, '%Y-%m-%d')
+                    # The round trip rejects the other ISO 8601 forms fromisoformat
+                    # accepts (compact YYYYMMDD, week dates like 2025-W01-1)
+                    if date.fromisoformat(target_date).isoformat() != target_date:
+                        raise ValueError(target_date)
                 except ValueError:
                     return create_response(400, {
                         'error': f'Invalid date format: {target_date}. Expected YYYY-MM-DD'
@@ -155,7 +237,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             })
 
         # Find the reflection
-        quote_entry = find_reflection_by_date(history, target_date)
+        quote_entry = find_reflection_by_date(history_index, target_date)
 
         if quote_entry is None:
             logger.info(f"No reflection found for date: {target_date}")
@@ -168,7 +250,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         response_body = format_reflection_response(quote_entry)
         logger.info(f"Successfully retrieved reflection for {target_date}")
 
-        return create_response(200, response_body)
+        return create_response(200, response_body, cache_seconds=cache_seconds)
 
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)
@@ -5,13 +5,121 @@ Provides templates and formatting functions for morning stoic reflection emails.
 """
 
 import html
-from typing import Dict
+import os
+import re
+from functools import lru_cache
+from string import Template
+
+from themes import MONTHLY_THEMES
+
+# Structured reflection fields, in display order
+REFLECTION_SECTIONS = ('understanding', 'connection', 'practice')
+
+# Email templates live in templates/ next to this module (copied into the
+# deployment package by the build scripts)
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+
+def _read_template(name: str) -> str:
+    """
+    Read a file from the templates directory.
+
+    Args:
+        name: Template file name
+
+    Returns:
+        File contents
+    """
+    with open(os.path.join(_TEMPLATE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _minify_css(css: str) -> str:
+    """
+    Strip the indentation and optional whitespace from a stylesheet.
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        Minified stylesheet
+    """
+    css = re.sub(r"\s*([{}:;,])\s*", r"\1", css)
+    return re.sub(r"\s+", " ", css).replace(";}", "}").strip()
+
+
+def _minify_html(source: str) -> str:
+    """
+    Remove the formatting whitespace from an HTML template.
+
+    Whitespace between tags is dropped and other runs that span a line break
+    collapse to a single space, which renders the same (the template has no
+    <pre> blocks or whitespace-sensitive inline markup between tags).
+
+    Args:
+        source: HTML template source
+
+    Returns:
+        Minified HTML template
+    """
+    source = re.sub(r">\s+<", "><", source)
+    return re.sub(r"\s*\n\s*", " ", source).strip()
+
+
+# Loaded and minified once per container at import time, not per email, so
+# every SES send ships fewer bytes. Everything up to <body> (including the
+# stylesheet) is static, so it is rendered once here. The body is split once
+# into its static fragments and placeholder names, so each email is a single
+# join instead of a regex substitution over the template.
+_CSS = _minify_css(_read_template("email.css"))
+_html_head, _body_tag, _html_body = _minify_html(_read_template("email.html")).partition("<body>")
+_HTML_HEAD = Template(_html_head).substitute(css=_CSS) + _body_tag
+_html_parts = re.split(r"\$\{(\w+)\}", _html_body)
+_HTML_FRAGMENTS = (_HTML_HEAD + _html_parts[0], *_html_parts[2::2])
+_HTML_FIELDS = tuple(_html_parts[1::2])
+
+
+# Plain-text layout; the divider is baked in once and the layout's own leading
+# and trailing whitespace is stripped here instead of per email
+_DIVIDER = "=" * 70
+_PLAIN_TEXT_TEMPLATE = f"""
+{_DIVIDER}
+MORNING STOIC REFLECTION
+{_DIVIDER}
+
+"{{quote}}"
+
+— {{attribution}}
+
+{_DIVIDER}
+
+UNDERSTANDING
+
+{{understanding}}
+
+CONNECTION TO 2025
+
+{{connection}}
+
+TODAY'S PRACTICE
+
+{{practice}}
+
+{_DIVIDER}
+Morning Stoic Reflection • Powered by Claude and James C. Mooney
+""".strip()
+
+
+@lru_cache(maxsize=32)
+def _escape_theme(theme: str) -> str:
+    """HTML-escape a theme name (there are only twelve, so results are cached)."""
+    return html.escape(theme)
 
 
 def format_html_email(
     quote: str,
     attribution: str,
-    reflection: Dict[str, str],
+    reflection: dict[str, str],
     theme: str,
     day_of_month: int = 1,
     days_in_month: int = 30
@@ -30,227 +138,30 @@ def format_html_email(
     Returns:
         Complete HTML email as a string
     """
-    # Escape HTML special characters
-    quote_safe = html.escape(quote)
-    attribution_safe = html.escape(attribution)
-    theme_safe = html.escape(theme)
-
-    # Format structured reflection sections
-    understanding_html = format_reflection_section(reflection.get('understanding', ''))
-    connection_html = format_reflection_section(reflection.get('connection', ''))
-    practice_html = format_reflection_section(reflection.get('practice', ''))
-
-    # Create progress indicator
-    progress_text = f"Day {day_of_month} of {days_in_month}"
-    progress_percent = (day_of_month / days_in_month) * 100
-
-    html_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="color-scheme" content="light dark">
-    <meta name="supported-color-schemes" content="light dark">
-    <title>Morning Stoic Reflection</title>
-    <style>
-        :root {{
-            color-scheme: light dark;
-        }}
-        body {{
-            font-family: Georgia, 'Times New Roman', serif;
-            line-height: 1.7;
-            color: #333333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f6fa;
-        }}
-        .container {{
-            background-color: #ffffff;
-            padding: 40px;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.07), 0 1px 3px rgba(0,0,0,0.06);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 35px;
-            border-bottom: 3px solid #34495e;
-            padding-bottom: 25px;
-        }}
-        .header h1 {{
-            margin: 0 0 8px 0;
-            color: #1a252f;
-            font-size: 32px;
-            font-weight: 600;
-            letter-spacing: -0.5px;
-        }}
-        .theme {{
-            color: #555555;
-            font-style: italic;
-            font-size: 15px;
-            margin-top: 8px;
-            font-weight: 500;
-        }}
-        .progress {{
-            margin-top: 12px;
-            font-size: 13px;
-            color: #666666;
-        }}
-        .progress-bar {{
-            height: 4px;
-            background-color: #e0e0e0;
-            border-radius: 2px;
-            margin-top: 6px;
-            overflow: hidden;
-        }}
-        .progress-fill {{
-            height: 100%;
-            background-color: #1e6091;
-            width: {progress_percent}%;
-            border-radius: 2px;
-        }}
-        .section-label {{
-            font-size: 11px;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 1.5px;
-            color: #666666;
-            margin: 30px 0 12px 0;
-        }}
-        .quote-section {{
-            margin-bottom: 35px;
-        }}
-        .quote {{
-            font-size: 20px;
-            font-style: italic;
-            color: #1a1a1a;
-            margin: 0;
-            padding: 25px;
-            background-color: #e8e8e8;
-            border-left: 5px solid #1e6091;
-            border-radius: 4px;
-            line-height: 1.8;
-        }}
-        .attribution {{
-            text-align: right;
-            color: #444444;
-            font-size: 14px;
-            margin-top: 12px;
-            font-weight: 500;
-        }}
-        .reflection-section {{
-            background-color: #f5f5f5;
-            padding: 25px;
-            border-radius: 6px;
-            margin-bottom: 20px;
-            border-left: 4px solid #cccccc;
-        }}
-        .reflection-section.understanding {{
-            border-left-color: #1e6091;
-        }}
-        .reflection-section.connection {{
-            border-left-color: #6b3d7a;
-        }}
-        .reflection-section.practice {{
-            border-left-color: #1d7a3c;
-            background-color: #e8f5e9;
-        }}
-        .section-title {{
-            font-size: 16px;
-            font-weight: 700;
-            color: #333333;
-            margin: 0 0 12px 0;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
-        .section-title.understanding {{
-            color: #155a7a;
-        }}
-        .section-title.connection {{
-            color: #5c2d6d;
-        }}
-        .section-title.practice {{
-            color: #166b34;
-        }}
-        .section-content {{
-            font-size: 16px;
-            line-height: 1.8;
-            color: #333333;
-            margin: 0;
-        }}
-        .footer {{
-            margin-top: 45px;
-            padding-top: 25px;
-            border-top: 2px solid #e0e0e0;
-            text-align: center;
-            font-size: 12px;
-            color: #666666;
-        }}
-        @media only screen and (max-width: 600px) {{
-            .container {{
-                padding: 25px 20px;
-            }}
-            .header h1 {{
-                font-size: 26px;
-            }}
-            .quote {{
-                font-size: 18px;
-                padding: 20px;
-            }}
-            .section-content {{
-                font-size: 15px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>Morning Stoic Reflection</h1>
-            <div class="theme">{theme_safe}</div>
-            <div class="progress">
-                {progress_text}
-                <div class="progress-bar">
-                    <div class="progress-fill"></div>
-                </div>
-            </div>
-        </div>
-
-        <div class="quote-section">
-            <div class="section-label">Today's Quote</div>
-            <div class="quote">
-                {quote_safe}
-            </div>
-            <div class="attribution">— {attribution_safe}</div>
-        </div>
-
-        <div class="section-label">Reflection</div>
-
-        <div class="reflection-section understanding">
-            <div class="section-title understanding">💡 Understanding</div>
-            <div class="section-content">{understanding_html}</div>
-        </div>
-
-        <div class="reflection-section connection">
-            <div class="section-title connection">🔗 Connection to 2025</div>
-            <div class="section-content">{connection_html}</div>
-        </div>
-
-        <div class="reflection-section practice">
-            <div class="section-title practice">✓ Today's Practice</div>
-            <div class="section-content">{practice_html}</div>
-        </div>
-
-        <div class="footer">
-            Morning Stoic Reflection • Powered by Claude and James C. Mooney
-        </div>
-    </div>
-</body>
-</html>"""
-
-    return html_template
-
-
-def format_plain_text_email(quote: str, attribution: str, reflection: Dict[str, str]) -> str:
+    # Escape every dynamic field in one pass (sections also get their
+    # whitespace collapsed) straight into the substitution mapping
+    fields = {
+        'quote_safe': html.escape(quote),
+        'attribution_safe': html.escape(attribution),
+        'theme_safe': _escape_theme(theme),
+        **{
+            f'{section}_html': format_reflection_section(reflection.get(section, ''))
+            for section in REFLECTION_SECTIONS
+        },
+        # Progress indicator
+        'progress_text': f"Day {day_of_month} of {days_in_month}",
+        'progress_percent': str((day_of_month / days_in_month) * 100)
+    }
+
+    # Interleave the static fragments with the field values
+    parts = [_HTML_FRAGMENTS[0]]
+    for name, fragment in zip(_HTML_FIELDS, _HTML_FRAGMENTS[1:]):
+        parts.append(fields[name])
+        parts.append(fragment)
+    return ''.join(parts)
+
+
+def format_plain_text_email(quote: str, attribution: str, reflection: dict[str, str]) -> str:
     """
     Format the daily reflection as plain text email (fallback).
 
@@ -262,40 +173,13 @@ def format_plain_text_email(quote: str, attribution: str, reflection: Dict[str,
     Returns:
         Plain text email as a string
     """
-    divider = "=" * 70
-
-    understanding = reflection.get('understanding', '')
-    connection = reflection.get('connection', '')
-    practice = reflection.get('practice', '')
-
-    plain_text = f"""
-{divider}
-MORNING STOIC REFLECTION
-{divider}
-
-"{quote}"
-
-— {attribution}
-
-{divider}
-
-UNDERSTANDING
-
-{understanding}
-
-CONNECTION TO 2025
-
-{connection}
-
-TODAY'S PRACTICE
-
-{practice}
-
-{divider}
-Morning Stoic Reflection • Powered by Claude and James C. Mooney
-"""
-
-    return plain_text.strip()
+    return _PLAIN_TEXT_TEMPLATE.format_map({
+        'quote': quote,
+        'attribution': attribution,
+        'understanding': reflection.get('understanding', ''),
+        'connection': reflection.get('connection', ''),
+        'practice': reflection.get('practice', '')
+    })
 
 
 def format_reflection_section(text: str) -> str:
@@ -313,48 +197,46 @@ def format_reflection_section(text: str) -> str:
     return html.escape(cleaned)
 
 
-def format_reflection_paragraphs(reflection: str) -> str:
+def create_email_subject(theme: str) -> str:
     """
-    Format reflection text into HTML paragraphs.
-
-    DEPRECATED: This function is kept for backward compatibility.
-    Use format_reflection_section instead.
+    Create the email subject line.
 
     Args:
-        reflection: Raw reflection text
+        theme: Monthly theme name
 
     Returns:
-        HTML formatted reflection with <p> tags
+        Email subject line
     """
-    # Split on double newlines to detect paragraphs
-    paragraphs = reflection.split('\n\n')
+    return f"Morning Stoic Reflection: {theme}"
 
-    # Escape HTML and wrap in <p> tags
-    formatted_paragraphs = []
-    for para in paragraphs:
-        # Remove extra whitespace and newlines within paragraph
-        cleaned = ' '.join(para.split())
-        if cleaned:  # Only add non-empty paragraphs
-            escaped = html.escape(cleaned)
-            formatted_paragraphs.append(f"<p>{escaped}</p>")
 
-    return '\n            '.join(formatted_paragraphs)
+# Subjects only depend on the month's theme, so they are built once at import
+_SUBJECTS_BY_MONTH = {
+    month: create_email_subject(theme['name'])
+    for month, theme in MONTHLY_THEMES.items()
+}
 
 
-def create_email_subject(theme: str) -> str:
+def create_email_subject_for_month(month: int) -> str:
     """
-    Create the email subject line.
+    Get the email subject line for a month's theme.
 
     Args:
-        theme: Monthly theme name
+        month: Month number (1-12)
 
     Returns:
         Email subject line
+
+    Raises:
+        ValueError: If month is not in range 1-12
     """
-    return f"Morning Stoic Reflection: {theme}"
+    try:
+        return _SUBJECTS_BY_MONTH[month]
+    except KeyError:
+        raise ValueError(f"Month must be between 1 and 12, got {month}")
 
 
-def validate_email_content(quote: str, attribution: str, reflection: Dict[str, str]) -> Dict[str, bool]:
+def validate_email_content(quote: str, attribution: str, reflection: dict[str, str]) -> dict[str, bool]:
     """
     Validate email content meets basic requirements.
 
@@ -366,32 +248,32 @@ def validate_email_content(quote: str, attribution: str, reflection: Dict[str, s
     Returns:
         Dictionary with validation results
     """
-    # Calculate total word count across all sections
-    understanding = reflection.get('understanding', '')
-    connection = reflection.get('connection', '')
-    practice = reflection.get('practice', '')
+    # Split each section once; the word lists give both the word count and
+    # whether the section has any non-whitespace content
+    understanding_words = reflection.get('understanding', '').split()
+    connection_words = reflection.get('connection', '').split()
+    practice_words = reflection.get('practice', '').split()
 
-    total_words = (len(understanding.split()) +
-                   len(connection.split()) +
-                   len(practice.split()))
+    total_words = len(understanding_words) + len(connection_words) + len(practice_words)
 
     validation = {
-        "has_quote": bool(quote and len(quote.strip()) > 0),
-        "has_attribution": bool(attribution and len(attribution.strip()) > 0),
-        "has_understanding": bool(understanding and len(understanding.strip()) > 0),
-        "has_connection": bool(connection and len(connection.strip()) > 0),
-        "has_practice": bool(practice and len(practice.strip()) > 0),
+        # isspace() checks for content without allocating a stripped copy
+        "has_quote": bool(quote) and not quote.isspace(),
+        "has_attribution": bool(attribution) and not attribution.isspace(),
+        "has_understanding": bool(understanding_words),
+        "has_connection": bool(connection_words),
+        "has_practice": bool(practice_words),
         "reflection_min_length": total_words >= 150,  # 150 words minimum total
         "reflection_max_length": total_words <= 250,  # 250 words maximum total
     }
 
-    validation["is_valid"] = all([
+    validation["is_valid"] = all((
         validation["has_quote"],
         validation["has_attribution"],
         validation["has_understanding"],
         validation["has_connection"],
         validation["has_practice"],
         validation["reflection_min_length"]
-    ])
+    ))
 
     return validation
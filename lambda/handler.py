@@ -6,36 +6,77 @@ stoic reflections via email.
 """
 
 import calendar
-import json
+import functools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # Import local modules
+import json_utils
 from themes import get_monthly_theme
 from quote_tracker import QuoteTracker
 from quote_loader import QuoteLoader
+from reflection_cache import ReflectionCache
 from email_formatter import (
     format_html_email,
     format_plain_text_email,
-    create_email_subject,
+    create_email_subject_for_month,
     validate_email_content
 )
-from anthropic_client import generate_reflection_only
+from anthropic_client import generate_reflection_only, warm_connection
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+# Concurrent SES sends; keep at or below the account's SES send rate (per second)
+SES_MAX_WORKERS = 8
+
+# Shared client config: a connection pool large enough for the concurrent SES
+# sends (so connections are reused instead of re-handshaking), TCP keep-alive,
+# and adaptive retries that back off when SES throttles
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    tcp_keepalive=True
+)
+
+# SES template holding the day's email for bulk sends (max 50 destinations per call)
+SES_TEMPLATE_NAME = "DailyStoicReflection"
+SES_BULK_BATCH_SIZE = 50
+
+
+@functools.cache
+def get_ses_client() -> Any:
+    """
+    Get the shared SES client, creating it on first use.
+
+    Creating clients lazily keeps them out of module import (and out of
+    SnapStart snapshots and unit tests that never send email).
+
+    Returns:
+        boto3 SES client
+    """
+    return boto3.client('ses', config=AWS_CLIENT_CONFIG)
+
+
+@functools.cache
+def get_s3_client() -> Any:
+    """
+    Get the shared S3 client, creating it on first use.
 
-# Initialize AWS clients
-ses_client = boto3.client('ses')
-s3_client = boto3.client('s3')
+    Returns:
+        boto3 S3 client
+    """
+    return boto3.client('s3', config=AWS_CLIENT_CONFIG)
 
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     Main Lambda function triggered daily by EventBridge.
 
@@ -56,9 +97,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         aws_region = os.environ.get('AWS_REGION', 'us-east-1')
 
         # Validate environment variables
-        if not all([bucket_name, sender_email, anthropic_api_key]):
+        if not (bucket_name and sender_email and anthropic_api_key):
             raise ValueError("Missing required environment variables")
 
+        # Create the AWS clients here on the main thread: boto3 client
+        # creation isn't thread-safe and the loads below run on worker threads
+        get_ses_client()
+        get_s3_client()
+
         logger.info(f"Using bucket: {bucket_name}")
         logger.info(f"Sender email: {sender_email}")
 
@@ -74,30 +120,49 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f"Month: {current_month}")
         logger.info(f"Theme: {theme_name}")
 
-        # 3. Load today's quote from the 365-day database
-        logger.info("Loading today's quote from database...")
-        quote_loader = QuoteLoader(bucket_name)
-        quote_data = quote_loader.get_quote_for_date(current_date)
-
-        quote = quote_data['quote']
-        attribution = quote_data['attribution']
-        # Note: theme from quote_data matches the monthly theme
-        logger.info(f"Loaded quote for {current_date_str}: {attribution}")
-
-        # 4. Load recipient config from S3
-        recipients = load_recipients_from_s3(bucket_name)
-        logger.info(f"Found {len(recipients)} recipients")
-
-        if not recipients:
-            raise ValueError("No recipients configured")
-
-        # 5. Load quote history and get current month's reflections
-        logger.info("Loading quote history from S3...")
-        tracker = QuoteTracker(bucket_name)
-        history = tracker.load_history()
-
-        # Get previous reflections from this month to provide context
-        previous_month_reflections = tracker.get_current_month_quotes(history, current_date)
+        # 3-5. Load quote, recipients, and history. The recipients and history
+        # GETs and the Anthropic TLS handshake run in the background, overlapping
+        # the quotes database GET, so none of them sits on the critical path
+        # before the API call.
+        tracker = QuoteTracker(bucket_name, s3_client=get_s3_client())
+
+        # Not a with block: on an error, shutdown must not wait for the
+        # warm-up, which can hang on a slow TLS handshake
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            executor.submit(warm_connection, anthropic_api_key)
+            logger.info("Loading recipients and quote history from S3...")
+            recipients_future = executor.submit(load_recipients_from_s3, bucket_name)
+            history_future = executor.submit(tracker.load_history)
+
+            # 3. Load today's quote from the 365-day database
+            logger.info("Loading today's quote from database...")
+            quote_loader = QuoteLoader(bucket_name, s3_client=get_s3_client())
+            quote_data = quote_loader.get_quote_for_date(current_date)
+
+            quote = quote_data['quote']
+            attribution = quote_data['attribution']
+            # Note: theme from quote_data matches the monthly theme
+            logger.info(f"Loaded quote for {current_date_str}: {attribution}")
+
+            # 4. Wait for recipient config from S3
+            recipients = recipients_future.result()
+            logger.info(f"Found {len(recipients)} recipients")
+
+            if not recipients:
+                raise ValueError("No recipients configured")
+
+            # 5. Wait for quote history to get current month's reflections
+            history = history_future.result()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        # Get previous reflections from this month to provide context, and the
+        # entries to keep (400 days for reasonable file size), in one pass
+        history_scan = tracker.scan_history(history, current_date, keep_days=400)
+        previous_month_reflections = history_scan.month_quotes
         logger.info(f"Found {len(previous_month_reflections)} previous reflections from this month")
 
         # 6. Generate reflection via Anthropic API
@@ -107,18 +172,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             attribution=attribution,
             theme=theme_name,
             api_key=anthropic_api_key,
-            previous_reflections=previous_month_reflections
+            previous_reflections=previous_month_reflections,
+            cache=ReflectionCache(bucket_name, s3_client=get_s3_client())
         )
 
         if not reflection:
             raise Exception("Failed to generate reflection from Anthropic API")
 
-        # Calculate total length for logging
-        total_length = sum(len(reflection[key]) for key in reflection)
-        logger.info(f"Generated structured reflection ({total_length} chars total)")
-        logger.info(f"  - Understanding: {len(reflection['understanding'])} chars")
-        logger.info(f"  - Connection: {len(reflection['connection'])} chars")
-        logger.info(f"  - Practice: {len(reflection['practice'])} chars")
+        logger.info("Generated structured reflection (%d chars total)",
+                    sum(len(text) for text in reflection.values()))
 
         # Validate content
         validation = validate_email_content(quote, attribution, reflection)
@@ -131,12 +193,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Convert structured reflection to single string for history storage
         reflection_text = f"{reflection['understanding']}\n\n{reflection['connection']}\n\n{reflection['practice']}"
 
-        # Add today's entry with full reflection
+        # Drop old quotes found by the scan, then add today's entry with full reflection
+        history['quotes'] = history_scan.kept
         history = tracker.add_quote(history, current_date_str, quote, attribution, reflection_text, theme_name)
 
-        # Cleanup old quotes (keep 400 days for reasonable file size)
-        history = tracker.cleanup_old_quotes(history, keep_days=400)
-
         tracker.save_history(history)
         logger.info(f"History updated. Total entries: {tracker.get_quote_count(history)}")
 
@@ -152,29 +212,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             days_in_month=days_in_month
         )
         plain_text = format_plain_text_email(quote, attribution, reflection)
-        subject = create_email_subject(theme_name)
+        subject = create_email_subject_for_month(current_month)
 
         logger.info("Sending emails...")
-        success_count = 0
-        failure_count = 0
-
-        for recipient in recipients:
-            try:
-                send_email_via_ses(
-                    sender=sender_email,
-                    recipient=recipient,
-                    subject=subject,
-                    html_body=html_content,
-                    text_body=plain_text,
-                    region=aws_region
-                )
-                success_count += 1
-                logger.info(f"Successfully sent email to {recipient}")
-
-            except Exception as e:
-                failure_count += 1
-                logger.error(f"Failed to send email to {recipient}: {e}")
-                # Continue with other recipients
+        success_count, failure_count = send_emails(
+            sender=sender_email,
+            recipients=recipients,
+            subject=subject,
+            html_body=html_content,
+            text_body=plain_text,
+            region=aws_region
+        )
 
         # 9. Return success
         logger.info(
@@ -183,7 +231,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': json_utils.dumps({
                 'message': f'Successfully sent to {success_count} of {len(recipients)} recipients',
                 'date': current_date_str,
                 'theme': theme_name,
@@ -197,13 +245,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error(f"Fatal error in lambda_handler: {e}", exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_utils.dumps({
                 'error': str(e)
             })
         }
 
 
-def load_recipients_from_s3(bucket_name: str) -> List[str]:
+def load_recipients_from_s3(bucket_name: str) -> list[str]:
     """
     Load recipient email addresses from S3 config file.
 
@@ -217,20 +265,19 @@ def load_recipients_from_s3(bucket_name: str) -> List[str]:
         Exception: If S3 read fails or config is invalid
     """
     try:
-        response = s3_client.get_object(
+        response = get_s3_client().get_object(
             Bucket=bucket_name,
             Key='recipients.json'
         )
-        content = response['Body'].read().decode('utf-8')
-        config = json.loads(content)
+        config = json_utils.loads(response['Body'].read())
 
         recipients = config.get('recipients', [])
 
         if not isinstance(recipients, list):
             raise ValueError("Recipients must be a list")
 
-        # Filter out empty strings
-        recipients = [r.strip() for r in recipients if r.strip()]
+        # Strip each address once and filter out empty strings
+        recipients = [r for r in (r.strip() for r in recipients) if r]
 
         return recipients
 
@@ -239,6 +286,155 @@ def load_recipients_from_s3(bucket_name: str) -> List[str]:
         raise
 
 
+def send_emails(
+    sender: str,
+    recipients: list[str],
+    subject: str,
+    html_body: str,
+    text_body: str,
+    region: str = 'us-east-1'
+) -> tuple[int, int]:
+    """
+    Send the daily email to every recipient.
+
+    With several recipients the content is published once as an SES template
+    and sent with SendBulkTemplatedEmail, so the body isn't uploaded per
+    recipient. Single recipients and content that SES would treat as template
+    syntax use concurrent individual sends, as do the recipients of any bulk
+    batch that failed (recipients of batches already sent are not resent).
+
+    Args:
+        sender: Sender email address
+        recipients: Recipient email addresses
+        subject: Email subject line
+        html_body: HTML email body
+        text_body: Plain text email body (fallback)
+        region: AWS region (default: us-east-1)
+
+    Returns:
+        Tuple of (success_count, failure_count)
+    """
+    success_count = 0
+    failure_count = 0
+
+    # SES templates use Handlebars, so "{{" in the content would be interpreted
+    if len(recipients) > 1 and "{{" not in subject + html_body + text_body:
+        success_count, failure_count, recipients = send_bulk_email_via_ses(
+            sender, recipients, subject, html_body, text_body
+        )
+        if not recipients:
+            return success_count, failure_count
+        logger.warning(f"Falling back to individual sends for {len(recipients)} unsent recipients")
+
+    # Each send is a network round-trip, so send to recipients concurrently
+    with ThreadPoolExecutor(max_workers=min(SES_MAX_WORKERS, len(recipients))) as executor:
+        futures = {
+            executor.submit(
+                send_email_via_ses,
+                sender=sender,
+                recipient=recipient,
+                subject=subject,
+                html_body=html_body,
+                text_body=text_body,
+                region=region
+            ): recipient
+            for recipient in recipients
+        }
+
+        for future in as_completed(futures):
+            recipient = futures[future]
+            try:
+                future.result()
+                success_count += 1
+                logger.info(f"Successfully sent email to {recipient}")
+
+            except Exception as e:
+                failure_count += 1
+                logger.error(f"Failed to send email to {recipient}: {e}")
+                # Continue with other recipients
+
+    return success_count, failure_count
+
+
+def send_bulk_email_via_ses(
+    sender: str,
+    recipients: list[str],
+    subject: str,
+    html_body: str,
+    text_body: str
+) -> tuple[int, int, list[str]]:
+    """
+    Send the same email to many recipients with SES bulk templated sends.
+
+    The day's content is stored as the SES template (created on first use),
+    then sent in batches of up to SES_BULK_BATCH_SIZE destinations per call.
+    A batch whose call fails is skipped and returned as unsent, so the caller
+    can retry just those recipients without resending the other batches.
+
+    Args:
+        sender: Sender email address
+        recipients: Recipient email addresses
+        subject: Email subject line
+        html_body: HTML email body
+        text_body: Plain text email body (fallback)
+
+    Returns:
+        Tuple of (success_count, failure_count, unsent_recipients). Every
+        recipient is unsent if the template can't be stored.
+    """
+    template = {
+        'TemplateName': SES_TEMPLATE_NAME,
+        'SubjectPart': subject,
+        'HtmlPart': html_body,
+        'TextPart': text_body
+    }
+    ses_client = get_ses_client()
+    try:
+        try:
+            ses_client.update_template(Template=template)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TemplateDoesNotExist':
+                raise
+            ses_client.create_template(Template=template)
+    except ClientError as e:
+        logger.warning(f"Could not store SES template, bulk send skipped: {e}")
+        return 0, 0, list(recipients)
+
+    success_count = 0
+    failure_count = 0
+    unsent: list[str] = []
+
+    for start in range(0, len(recipients), SES_BULK_BATCH_SIZE):
+        batch = recipients[start:start + SES_BULK_BATCH_SIZE]
+        try:
+            response = ses_client.send_bulk_templated_email(
+                Source=sender,
+                Template=SES_TEMPLATE_NAME,
+                DefaultTemplateData='{}',
+                Destinations=[
+                    {'Destination': {'ToAddresses': [recipient]}}
+                    for recipient in batch
+                ]
+            )
+        except ClientError as e:
+            logger.warning(f"Bulk send failed for a batch of {len(batch)} recipients: {e}")
+            unsent.extend(batch)
+            continue
+
+        # Statuses are returned in the same order as the destinations
+        for recipient, status in zip(batch, response['Status']):
+            if status['Status'] == 'Success':
+                success_count += 1
+                logger.info(f"Successfully sent email to {recipient} "
+                            f"(SES MessageId: {status.get('MessageId')})")
+            else:
+                failure_count += 1
+                logger.error(f"Failed to send email to {recipient}: "
+                             f"{status['Status']} {status.get('Error', '')}")
+
+    return success_count, failure_count, unsent
+
+
 def send_email_via_ses(
     sender: str,
     recipient: str,
@@ -262,7 +458,7 @@ def send_email_via_ses(
         Exception: If email send fails
     """
     try:
-        response = ses_client.send_email(
+        response = get_ses_client().send_email(
             Source=sender,
             Destination={
                 'ToAddresses': [recipient]
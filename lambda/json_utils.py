@@ -0,0 +1,67 @@
+"""
+JSON serialization helpers.
+
+Uses orjson when it is packaged with the Lambda function and falls back to
+the standard library json module otherwise (e.g. local development and tests).
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed packages
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data: JSON document as str or UTF-8 encoded bytes
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson.JSONDecodeError is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string.
+
+    Non-ASCII characters are emitted as-is rather than \\u-escaped.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON document as str
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize an object to compact UTF-8 encoded JSON.
+
+    Produces the same document as dumps(), encoded.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
@@ -8,30 +8,65 @@ Maps calendar dates to specific quotes from stoic_quotes_365_days.json.
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any
 import boto3
 from botocore.exceptions import ClientError
 
+import json_utils
+
+try:
+    # Generated into the deployment package by the build scripts
+    from quotes_data import QUOTES as PACKAGED_QUOTES
+except ImportError:
+    PACKAGED_QUOTES = None
+
 logger = logging.getLogger(__name__)
 
+# Lowercase month names as used for the database keys, indexed by month - 1
+# (avoids a locale-dependent strftime('%B') per lookup)
+_MONTHS = (
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+)
+
+# Quotes databases by bucket; module scope persists across warm Lambda invocations
+_QUOTES_DB_CACHE: dict[str, dict[str, Any]] = {}
+
+# (month name, day) -> quote entry, built once per database
+_QUOTE_INDEX_CACHE: dict[str, dict[tuple[str, int], dict[str, Any]]] = {}
+
 
 class QuoteLoader:
     """Loads daily quotes from the 365-day quote database."""
 
-    def __init__(self, bucket_name: str):
+    def __init__(self, bucket_name: str, s3_client: Any | None = None):
         """
         Initialize the QuoteLoader.
 
         Args:
             bucket_name: S3 bucket containing the quotes database
+            s3_client: Existing S3 client to reuse (default: create one on first use)
         """
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client('s3')
-        self._quotes_cache: Optional[Dict[str, Any]] = None
-
-    def load_quotes_database(self) -> Dict[str, Any]:
+        # Created on first use when not given: only the S3 fallback in
+        # load_quotes_database needs it, and the packaged quotes usually make
+        # that unnecessary
+        self._s3_client: Any | None = s3_client
+
+    @property
+    def s3_client(self) -> Any:
+        """boto3 S3 client, created the first time it is needed."""
+        if self._s3_client is None:
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
+
+    def load_quotes_database(self) -> dict[str, Any]:
         """
-        Load the complete 365-day quotes database from S3.
+        Load the complete 365-day quotes database.
+
+        Uses the copy packaged with the deployment (quotes_data.py) when it is
+        present, and otherwise loads it from S3. Either way the database is
+        cached at module level, so warm Lambda containers load it only once.
 
         Returns:
             Dictionary with monthly quote data
@@ -39,8 +74,15 @@ class QuoteLoader:
         Raises:
             Exception: If the database cannot be loaded
         """
-        if self._quotes_cache is not None:
-            return self._quotes_cache
+        cached = _QUOTES_DB_CACHE.get(self.bucket_name)
+        if cached is not None:
+            return cached
+
+        if PACKAGED_QUOTES is not None:
+            logger.info("Using quotes database packaged with the deployment")
+            _QUOTES_DB_CACHE[self.bucket_name] = PACKAGED_QUOTES
+            _QUOTE_INDEX_CACHE[self.bucket_name] = build_quote_index(PACKAGED_QUOTES)
+            return PACKAGED_QUOTES
 
         try:
             logger.info(f"Loading quotes database from s3://{self.bucket_name}/config/stoic_quotes_365_days.json")
@@ -49,8 +91,10 @@ class QuoteLoader:
                 Key='config/stoic_quotes_365_days.json'
             )
 
-            quotes_data = json.loads(response['Body'].read().decode('utf-8'))
-            self._quotes_cache = quotes_data
+            # json_utils parses the raw bytes directly (orjson when packaged)
+            quotes_data = json_utils.loads(response['Body'].read())
+            _QUOTES_DB_CACHE[self.bucket_name] = quotes_data
+            _QUOTE_INDEX_CACHE[self.bucket_name] = build_quote_index(quotes_data)
             logger.info("Successfully loaded quotes database")
             return quotes_data
 
@@ -66,7 +110,7 @@ class QuoteLoader:
             logger.error(f"Invalid JSON in quotes database: {str(e)}")
             raise Exception("Quotes database contains invalid JSON")
 
-    def get_quote_for_date(self, date: datetime) -> Dict[str, str]:
+    def get_quote_for_date(self, date: datetime) -> dict[str, str]:
         """
         Get the appropriate quote for a specific date.
 
@@ -83,9 +127,10 @@ class QuoteLoader:
             Exception: If quote cannot be found for the given date
         """
         quotes_db = self.load_quotes_database()
+        quote_index = _QUOTE_INDEX_CACHE[self.bucket_name]
 
         # Get month name (lowercase)
-        month_name = date.strftime('%B').lower()
+        month_name = _MONTHS[date.month - 1]
         day_num = date.day
 
         # Handle leap year: Feb 29 -> use Feb 28
@@ -97,22 +142,19 @@ class QuoteLoader:
         if month_name not in quotes_db:
             raise Exception(f"Month '{month_name}' not found in quotes database")
 
-        month_quotes = quotes_db[month_name]
-
-        # Find quote for this day
-        for quote_entry in month_quotes:
-            if quote_entry['day'] == day_num:
-                logger.info(f"Found quote for {month_name.title()} {day_num}")
-                return {
-                    'quote': quote_entry['quote'],
-                    'attribution': quote_entry['attribution'],
-                    'theme': quote_entry['theme']
-                }
-
-        # If we get here, the day wasn't found
-        raise Exception(f"No quote found for {month_name.title()} {day_num}")
+        try:
+            quote_entry = quote_index[(month_name, day_num)]
+        except KeyError:
+            raise Exception(f"No quote found for {month_name.title()} {day_num}")
+
+        logger.info(f"Found quote for {month_name.title()} {day_num}")
+        return {
+            'quote': quote_entry['quote'],
+            'attribution': quote_entry['attribution'],
+            'theme': quote_entry['theme']
+        }
 
-    def validate_database_completeness(self) -> Dict[str, Any]:
+    def validate_database_completeness(self) -> dict[str, Any]:
         """
         Validate that the quotes database contains all 365 days.
 
@@ -188,7 +230,27 @@ class QuoteLoader:
         return validation_result
 
 
-def get_quote_for_date(bucket_name: str, date: datetime) -> Dict[str, str]:
+def build_quote_index(quotes_data: dict[str, Any]) -> dict[tuple[str, int], dict[str, Any]]:
+    """
+    Index quote entries by (month name, day) for O(1) date lookups.
+
+    If a day appears more than once, the first entry wins, matching the
+    previous linear scan.
+
+    Args:
+        quotes_data: Parsed quotes database keyed by lowercase month name
+
+    Returns:
+        Dictionary mapping (month name, day) to the quote entry
+    """
+    index: dict[tuple[str, int], dict[str, Any]] = {}
+    for month_name, entries in quotes_data.items():
+        for entry in entries:
+            index.setdefault((month_name, entry['day']), entry)
+    return index
+
+
+def get_quote_for_date(bucket_name: str, date: datetime) -> dict[str, str]:
     """
     Convenience function to get a quote for a specific date.
 
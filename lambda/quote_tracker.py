@@ -4,33 +4,193 @@ Quote history archival functionality.
 Manages quote history in S3 for posterity, tracking daily quotes and reflections.
 """
 
-import json
+import bisect
+import gzip
+import hashlib
+import itertools
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Any, NamedTuple, TypedDict
 import boto3
 from botocore.exceptions import ClientError
 
+import json_utils
+
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+
+class QuoteEntry(TypedDict):
+    """Type definition for a quote history entry (stored as a plain dict)."""
+    date: str  # YYYY-MM-DD
+    quote: str
+    attribution: str
+    theme: str
+    reflection: str
+
+
+class HistoryScan(NamedTuple):
+    """Results of a single pass over the quote history."""
+    month_quotes: list[QuoteEntry]  # Current month, before the current date
+    kept: list[QuoteEntry]  # Inside the retention window
+
+
+# First two bytes of every gzip stream
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def encode_history(history: dict[str, Any]) -> bytes:
+    """
+    Serialize quote history for storage in S3.
+
+    The history is written as compact JSON and gzip-compressed, which shrinks
+    the object several times over (gzip's CRC32 also catches corruption when
+    it is read back). The gzip header timestamp is fixed, so the same history
+    always encodes to the same bytes.
+
+    Args:
+        history: Dictionary with 'quotes' list
+
+    Returns:
+        gzip-compressed JSON bytes
+    """
+    return gzip.compress(json_utils.dumps_bytes(history), compresslevel=6, mtime=0)
+
+
+def decode_history(body: bytes) -> dict[str, Any]:
+    """
+    Deserialize quote history read from S3.
+
+    Accepts both gzip-compressed JSON and plain JSON (files written before
+    compression was added, or uploaded by hand).
+
+    Args:
+        body: Raw S3 object bytes
+
+    Returns:
+        Quote history dictionary
+
+    Raises:
+        gzip.BadGzipFile: If compressed data is corrupt
+        json.JSONDecodeError: If the JSON is invalid
+    """
+    if body[:2] == GZIP_MAGIC:
+        body = gzip.decompress(body)
+    return json_utils.loads(body)
+
+
+def _body_digest(body: bytes) -> bytes:
+    """Hash a stored history object to detect unchanged saves."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _has_iso_date(quote_entry: Any) -> bool:
+    """Check that an entry is a dict with a YYYY-MM-DD shaped 'date' string."""
+    if not isinstance(quote_entry, dict):
+        return False
+    date = quote_entry.get('date')
+    return isinstance(date, str) and len(date) == 10 and date[4] == '-' and date[7] == '-'
+
+
+def _entry_date(quote_entry: QuoteEntry) -> str:
+    """Sort key for history entries (entries without a date sort first)."""
+    return quote_entry.get('date', '')
+
+
+def _is_sorted(quotes: list[QuoteEntry]) -> bool:
+    """Check in one pass that history entries are in date order."""
+    return all(_entry_date(a) <= _entry_date(b) for a, b in itertools.pairwise(quotes))
+
+
+def _sorted_quotes(history: dict[str, Any]) -> list[QuoteEntry]:
+    """
+    Return history['quotes'] in date order without modifying history.
+
+    Histories from load_history() and add_quote() are already sorted, so this
+    is normally a single comparison pass that returns the stored list itself.
+    Only a history built or edited elsewhere out of order is copied and sorted.
+    """
+    quotes = history['quotes']
+    if _is_sorted(quotes):
+        return quotes
+    return sorted(quotes, key=_entry_date)
+
+
+def _first_at_or_after(quotes: list[QuoteEntry], moment: datetime, lo: int = 0) -> int:
+    """
+    Find the first entry whose date, read as midnight, is at or after moment.
+
+    Entries hold bare YYYY-MM-DD dates, which order lexicographically like the
+    midnight datetimes they denote, so the search compares against moment's
+    date string: an entry on moment's own day counts as at or after it only
+    when moment is exactly midnight.
+
+    Args:
+        quotes: History entries sorted by date
+        moment: Point in time to compare against
+        lo: Index to start searching from
+
+    Returns:
+        Index of the first such entry (len(quotes) if there is none)
+    """
+    day = moment.date().isoformat()
+    if moment == moment.replace(hour=0, minute=0, second=0, microsecond=0):
+        return bisect.bisect_left(quotes, day, lo=lo, key=_entry_date)
+    return bisect.bisect_right(quotes, day, lo=lo, key=_entry_date)
+
+
+def _current_month_range(quotes: list[QuoteEntry], current_date: datetime) -> tuple[int, int]:
+    """
+    Find the current month's entries before current_date in date-sorted quotes.
+
+    Every date from "YYYY-MM-" up to current_date is in the current month, so
+    the range runs from that prefix to _first_at_or_after(current_date).
+
+    Args:
+        quotes: History entries sorted by date
+        current_date: Current date to determine month and year
+
+    Returns:
+        (start, end) slice indices into quotes
+    """
+    month_start = bisect.bisect_left(quotes, current_date.strftime('%Y-%m-'), key=_entry_date)
+    month_end = _first_at_or_after(quotes, current_date, lo=month_start)
+    return month_start, month_end
 
 
 class QuoteTracker:
-    """Manages quote history in S3 for archival purposes."""
+    """
+    Manages quote history in S3 for archival purposes.
 
-    def __init__(self, bucket_name: str, history_key: str = "quote_history.json"):
+    history['quotes'] is expected to be sorted by date: load_history sorts it
+    and add_quote keeps it sorted. The date-range lookups binary-search it
+    directly instead of scanning every entry, and never reorder it (see
+    _sorted_quotes); only cleanup_old_quotes, which modifies history anyway,
+    sorts an out-of-order list in place.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        history_key: str = "quote_history.json",
+        s3_client: Any | None = None
+    ):
         """
         Initialize the QuoteTracker.
 
         Args:
             bucket_name: Name of the S3 bucket
             history_key: S3 key for the history file (default: quote_history.json)
+            s3_client: Existing S3 client to reuse (default: create a new one)
         """
         self.bucket_name = bucket_name
         self.history_key = history_key
-        self.s3_client = boto3.client('s3')
+        self.s3_client = s3_client if s3_client is not None else boto3.client('s3')
+        # Digest of the history object as last loaded, for skipping no-op saves
+        self._loaded_digest: bytes | None = None
 
-    def load_history(self) -> Dict[str, Any]:
+    def load_history(self) -> dict[str, Any]:
         """
         Load quote history from S3.
 
@@ -45,9 +205,22 @@ class QuoteTracker:
                 Bucket=self.bucket_name,
                 Key=self.history_key
             )
-            content = response['Body'].read().decode('utf-8')
-            history = json.loads(content)
-            logger.info(f"Loaded history with {len(history.get('quotes', []))} quotes")
+            body = response['Body'].read()
+            self._loaded_digest = _body_digest(body)
+            history = decode_history(body)
+
+            # Validate and sort entries once here, so the other methods can
+            # index history['quotes'] directly and binary-search it by date.
+            # Sorting is close to free on a history that is already in order,
+            # and fixes one that was edited or restored by hand.
+            quotes = history.setdefault('quotes', [])
+            valid_quotes = [q for q in quotes if _has_iso_date(q)]
+            if len(valid_quotes) != len(quotes):
+                logger.warning(f"Dropped {len(quotes) - len(valid_quotes)} history entries without a valid date")
+            valid_quotes.sort(key=_entry_date)
+            history['quotes'] = valid_quotes
+
+            logger.info(f"Loaded history with {len(history['quotes'])} quotes")
             return history
 
         except ClientError as e:
@@ -60,25 +233,59 @@ class QuoteTracker:
                 logger.error(f"Error loading history from S3: {e}")
                 raise
 
-    def save_history(self, history: Dict[str, Any]) -> None:
+    def get_history_etag(self) -> str | None:
+        """
+        Get the ETag of the history file without downloading it.
+
+        Returns:
+            ETag string, or None if the history file doesn't exist yet
+
+        Raises:
+            Exception: If the S3 request fails (except for missing file)
+        """
+        try:
+            response = self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=self.history_key
+            )
+            return response['ETag']
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ('404', 'NoSuchKey'):
+                return None
+            logger.error(f"Error reading history metadata from S3: {e}")
+            raise
+
+    def save_history(self, history: dict[str, Any]) -> None:
         """
         Save quote history to S3.
 
+        The PUT is skipped when the encoded history is identical to what
+        load_history() read (e.g. nothing was added).
+
         Args:
             history: Dictionary with 'quotes' list to save
 
         Raises:
             Exception: If S3 write fails
         """
+        body = encode_history(history)
+        digest = _body_digest(body)
+        if digest == self._loaded_digest:
+            logger.info("History unchanged, skipping save")
+            return
+
         try:
-            content = json.dumps(history, indent=2)
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=self.history_key,
-                Body=content.encode('utf-8'),
-                ContentType='application/json'
+                Body=body,
+                ContentType='application/json',
+                ContentEncoding='gzip'
             )
-            logger.info(f"Saved history with {len(history.get('quotes', []))} quotes")
+            self._loaded_digest = digest
+            logger.info(f"Saved history with {len(history['quotes'])} quotes")
 
         except ClientError as e:
             logger.error(f"Error saving history to S3: {e}")
@@ -86,16 +293,19 @@ class QuoteTracker:
 
     def add_quote(
         self,
-        history: Dict[str, Any],
+        history: dict[str, Any],
         date: str,
         quote: str,
         attribution: str,
         reflection: str,
         theme: str
-    ) -> Dict[str, Any]:
+    ) -> dict[str, Any]:
         """
         Add a new quote and reflection to the history for archival purposes.
 
+        The entry is inserted in date order (normally at the end), keeping the
+        history sorted for the binary searches in cleanup and scanning.
+
         Args:
             history: Existing quote history dictionary
             date: ISO format date string (YYYY-MM-DD)
@@ -107,10 +317,7 @@ class QuoteTracker:
         Returns:
             Updated history dictionary
         """
-        if 'quotes' not in history:
-            history['quotes'] = []
-
-        new_entry = {
+        new_entry: QuoteEntry = {
             "date": date,
             "quote": quote,
             "attribution": attribution,
@@ -118,12 +325,13 @@ class QuoteTracker:
             "reflection": reflection
         }
 
-        history['quotes'].append(new_entry)
+        # setdefault covers histories built in memory without a 'quotes' list
+        bisect.insort(history.setdefault('quotes', []), new_entry, key=_entry_date)
         logger.info(f"Added entry to history: {attribution} on {date}")
 
         return history
 
-    def get_quote_count(self, history: Dict[str, Any]) -> int:
+    def get_quote_count(self, history: dict[str, Any]) -> int:
         """
         Get total number of quotes in history.
 
@@ -133,13 +341,13 @@ class QuoteTracker:
         Returns:
             Number of quotes in history
         """
-        return len(history.get('quotes', []))
+        return len(history['quotes'])
 
     def get_current_month_quotes(
         self,
-        history: Dict[str, Any],
+        history: dict[str, Any],
         current_date: datetime
-    ) -> List[Dict[str, Any]]:
+    ) -> list[QuoteEntry]:
         """
         Get all quotes from the current month and year.
 
@@ -150,57 +358,83 @@ class QuoteTracker:
         Returns:
             List of quote entries from the current month
         """
-        current_month = current_date.month
-        current_year = current_date.year
-
-        filtered_quotes = []
-        for quote_entry in history.get('quotes', []):
-            try:
-                quote_date = datetime.fromisoformat(quote_entry['date'])
-                if quote_date.month == current_month and quote_date.year == current_year:
-                    # Only include quotes from before the current date
-                    if quote_date < current_date:
-                        filtered_quotes.append(quote_entry)
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Skipping invalid quote entry: {e}")
-                continue
+        quotes = _sorted_quotes(history)
+        month_start, month_end = _current_month_range(quotes, current_date)
+        filtered_quotes = quotes[month_start:month_end]
 
         logger.info(f"Found {len(filtered_quotes)} quotes from current month")
         return filtered_quotes
 
     def cleanup_old_quotes(
         self,
-        history: Dict[str, Any],
-        keep_days: int = 400
-    ) -> Dict[str, Any]:
+        history: dict[str, Any],
+        keep_days: int = 400,
+        current_date: datetime | None = None
+    ) -> dict[str, Any]:
         """
         Remove quotes older than specified days to keep file size manageable.
-        Keeps a buffer beyond the 365-day repeat window.
+        Keeps a buffer beyond the 365-day repeat window. history['quotes'] is
+        trimmed in place (and sorted by date first if it is out of order).
 
         Args:
             history: Quote history dictionary
             keep_days: Number of days of history to keep (default: 400)
+            current_date: Date the retention window ends on (default: now)
 
         Returns:
             Updated history dictionary with old quotes removed
         """
-        cutoff_date = datetime.now() - timedelta(days=keep_days)
-        original_count = len(history.get('quotes', []))
+        # The kept entries are the sorted list's suffix from the first date at
+        # or after the cutoff, so trim its prefix in place
+        cutoff = (current_date or datetime.now()) - timedelta(days=keep_days)
+        quotes = history['quotes']
+        if not _is_sorted(quotes):
+            quotes.sort(key=_entry_date)
+        start = _first_at_or_after(quotes, cutoff)
+
+        # Nothing to remove in the common case: the oldest entry is recent
+        # enough, so leave history as is
+        if start == 0:
+            return history
+
+        del quotes[:start]
+        logger.info(f"Cleaned up {start} old quotes from history")
+
+        return history
 
-        filtered_quotes = []
-        for quote_entry in history.get('quotes', []):
-            try:
-                quote_date = datetime.fromisoformat(quote_entry['date'])
-                if quote_date >= cutoff_date:
-                    filtered_quotes.append(quote_entry)
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Skipping invalid quote entry during cleanup: {e}")
-                continue
+    def scan_history(
+        self,
+        history: dict[str, Any],
+        current_date: datetime,
+        keep_days: int = 400
+    ) -> HistoryScan:
+        """
+        Collect the current month's quotes and the retained quotes.
 
-        history['quotes'] = filtered_quotes
-        removed_count = original_count - len(filtered_quotes)
+        Equivalent to get_current_month_quotes() plus cleanup_old_quotes(), but
+        both ranges are found by binary search over the date-sorted history.
 
+        Args:
+            history: Quote history dictionary
+            current_date: Current date to determine month, year, and retention cutoff
+            keep_days: Number of days of history to keep (default: 400)
+
+        Returns:
+            HistoryScan with the current month's quotes and the kept quotes
+        """
+        cutoff = current_date - timedelta(days=keep_days)
+        quotes = _sorted_quotes(history)
+
+        kept_start = _first_at_or_after(quotes, cutoff)
+        month_start, month_end = _current_month_range(quotes, current_date)
+
+        # Reuse the list when nothing falls outside the retention window
+        kept = quotes[kept_start:] if kept_start else quotes
+        month_quotes = quotes[month_start:month_end]
+
+        removed_count = kept_start
         if removed_count > 0:
-            logger.info(f"Cleaned up {removed_count} old quotes from history")
+            logger.info(f"{removed_count} old quotes are outside the retention window")
+        logger.info(f"Found {len(month_quotes)} quotes from current month")
 
-        return history
+        return HistoryScan(month_quotes=month_quotes, kept=kept)
@@ -0,0 +1,115 @@
+"""
+Exact-match cache for generated reflections.
+
+Stores Anthropic responses in S3 keyed by a hash of the request, so retries,
+reruns, and backfills of the same day reuse the reflection instead of calling
+the API again.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+import json_utils
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+
+class ReflectionCache:
+    """S3-backed cache of reflections keyed by request content."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = "cache/reflections/",
+        s3_client: Any | None = None
+    ):
+        """
+        Initialize the ReflectionCache.
+
+        Args:
+            bucket_name: Name of the S3 bucket
+            prefix: S3 key prefix for cached reflections (default: cache/reflections/)
+            s3_client: Existing S3 client to reuse (default: create a new one)
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.s3_client = s3_client if s3_client is not None else boto3.client('s3')
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from the request parts.
+
+        Args:
+            *parts: Strings that fully determine the request (model, prompts, ...)
+
+        Returns:
+            32-character hex digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            encoded = part.encode('utf-8')
+            # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[str, str] | None:
+        """
+        Look up a cached reflection.
+
+        Cache errors are logged and treated as a miss.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached reflection dictionary, or None on a miss
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=f"{self.prefix}{key}.json"
+            )
+            reflection = json_utils.loads(response['Body'].read())
+            logger.info(f"Reflection cache hit: {key}")
+            return reflection
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                logger.info(f"Reflection cache miss: {key}")
+            else:
+                logger.warning(f"Reflection cache lookup failed, treating as miss: {e}")
+            return None
+
+        except Exception as e:
+            logger.warning(f"Reflection cache lookup failed, treating as miss: {e}")
+            return None
+
+    def put(self, key: str, reflection: dict[str, str]) -> None:
+        """
+        Store a reflection in the cache.
+
+        Cache errors are logged and never raised.
+
+        Args:
+            key: Cache key from make_key()
+            reflection: Reflection dictionary to store
+        """
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=f"{self.prefix}{key}.json",
+                Body=json_utils.dumps_bytes(reflection),
+                ContentType='application/json'
+            )
+            logger.info(f"Stored reflection in cache: {key}")
+
+        except Exception as e:
+            logger.warning(f"Failed to store reflection in cache: {e}")
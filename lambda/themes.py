@@ -4,7 +4,8 @@ Monthly themes for stoic reflections.
 Each month has a distinct theme that guides quote selection and reflection content.
 """
 
-from typing import Dict, TypedDict
+from functools import lru_cache
+from typing import TypedDict
 
 
 class ThemeInfo(TypedDict):
@@ -14,7 +15,7 @@ class ThemeInfo(TypedDict):
 
 
 # Monthly themes following the PRD specification
-MONTHLY_THEMES: Dict[int, ThemeInfo] = {
+MONTHLY_THEMES: dict[int, ThemeInfo] = {
     1: {
         "name": "Discipline and Self-Improvement",
         "description": "Focus on building habits, self-control, and starting fresh"
@@ -66,6 +67,12 @@ MONTHLY_THEMES: Dict[int, ThemeInfo] = {
 }
 
 
+# Themes indexed by month - 1, so lookups are a tuple index instead of a dict
+# hash. MONTHLY_THEMES is treated as immutable: the entries are shared with
+# every caller, and get_theme_name/get_theme_description cache their results.
+_THEMES_BY_MONTH: tuple[ThemeInfo, ...] = tuple(MONTHLY_THEMES[month] for month in range(1, 13))
+
+
 def get_monthly_theme(month: int) -> ThemeInfo:
     """
     Get the theme information for a given month.
@@ -74,17 +81,19 @@ def get_monthly_theme(month: int) -> ThemeInfo:
         month: Month number (1-12)
 
     Returns:
-        ThemeInfo dictionary with name and description
+        ThemeInfo dictionary with name and description (shared; don't modify it)
 
     Raises:
         ValueError: If month is not in range 1-12
     """
-    if month < 1 or month > 12:
+    # The range check also keeps negative months from indexing from the end
+    if not 1 <= month <= 12:
         raise ValueError(f"Month must be between 1 and 12, got {month}")
 
-    return MONTHLY_THEMES[month]
+    return _THEMES_BY_MONTH[month - 1]
 
 
+@lru_cache(maxsize=13)
 def get_theme_name(month: int) -> str:
     """
     Get just the theme name for a given month.
@@ -98,6 +107,7 @@ def get_theme_name(month: int) -> str:
     return get_monthly_theme(month)["name"]
 
 
+@lru_cache(maxsize=13)
 def get_theme_description(month: int) -> str:
     """
     Get just the theme description for a given month.
@@ -0,0 +1,10 @@
+"""Shared pytest configuration for the unit tests."""
+
+import sys
+from pathlib import Path
+
+# Make the Lambda modules importable as top-level modules (as they are in the
+# deployed package). Done once here instead of in every test module.
+lambda_dir = str(Path(__file__).parent.parent / "lambda")
+if lambda_dir not in sys.path:
+    sys.path.insert(0, lambda_dir)
@@ -0,0 +1,179 @@
+"""Unit tests for anthropic_client module."""
+
+import json
+import pytest
+
+from anthropic_client import (
+    SYSTEM_PROMPT,
+    _iter_sse_text,
+    _parse_batch_results,
+    build_reflection_prompt,
+    parse_reflection_response,
+    validate_attribution_format
+)
+
+
+RAW_JSON = (
+    '{"understanding": "Understanding text.", '
+    '"connection": "Connection text.", '
+    '"practice": "Practice text."}'
+)
+
+
+class TestAnthropicClient:
+    """Test cases for response parsing and validation."""
+
+    def test_parse_reflection_response_raw_json(self):
+        """Test parsing a raw JSON response."""
+        reflection = parse_reflection_response(RAW_JSON)
+
+        assert reflection["understanding"] == "Understanding text."
+        assert reflection["connection"] == "Connection text."
+        assert reflection["practice"] == "Practice text."
+
+    def test_parse_reflection_response_code_block(self):
+        """Test parsing JSON wrapped in a markdown code block."""
+        response = f"Here is the reflection:\n\n```json\n{RAW_JSON}\n```\n"
+        reflection = parse_reflection_response(response)
+
+        assert reflection["understanding"] == "Understanding text."
+        assert reflection["practice"] == "Practice text."
+
+    def test_parse_reflection_response_bare_code_block(self):
+        """Test parsing a code block without a language tag or preamble."""
+        reflection = parse_reflection_response(f"```\n{RAW_JSON}\n```")
+
+        assert reflection["connection"] == "Connection text."
+
+    def test_parse_reflection_response_trailing_text_with_braces(self):
+        """Test that text after the code block doesn't leak into the JSON."""
+        response = f"```json\n{RAW_JSON}\n```\nLet me know if you want {{changes}}."
+        reflection = parse_reflection_response(response)
+
+        assert reflection["practice"] == "Practice text."
+
+    def test_parse_reflection_response_braces_inside_strings(self):
+        """Test that braces and escaped quotes inside values are handled."""
+        response = (
+            '```json\n{"understanding": "Use {braces} and \\"quotes\\" }", '
+            '"connection": "b", "practice": "c"}\n```'
+        )
+        reflection = parse_reflection_response(response)
+
+        assert reflection["understanding"] == 'Use {braces} and "quotes" }'
+
+    def test_parse_reflection_response_strips_whitespace(self):
+        """Test that field values are stripped."""
+        response = '{"understanding": "  a  ", "connection": "b\\n", "practice": " c"}'
+        reflection = parse_reflection_response(response)
+
+        assert reflection == {"understanding": "a", "connection": "b", "practice": "c"}
+
+    def test_parse_reflection_response_invalid_json(self):
+        """Test that invalid JSON raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_reflection_response("not json at all")
+
+    def test_parse_reflection_response_missing_field(self):
+        """Test that a missing field raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_reflection_response('{"understanding": "a", "connection": "b"}')
+
+    def test_validate_attribution_format_valid(self):
+        """Test known author attributions."""
+        assert validate_attribution_format("Marcus Aurelius - Meditations 5.1") is True
+        assert validate_attribution_format("Seneca - Letters 1.1") is True
+        assert validate_attribution_format(
+            "Attributed to Plato, cited by Marcus Aurelius - Meditations 7.35"
+        ) is True
+
+    def test_validate_attribution_format_invalid(self):
+        """Test attributions with unknown authors or no separator."""
+        assert validate_attribution_format("Marcus Aurelius") is False
+        assert validate_attribution_format("Epicurus - Fragments") is False
+
+    def test_build_reflection_prompt_without_context(self):
+        """Test prompt substitution with no previous reflections."""
+        prompt = build_reflection_prompt("Quote text.", "Seneca - Letters 1.1", "Resilience")
+
+        assert prompt.startswith("You have been given this stoic quote")
+        assert '"Quote text."\n— Seneca - Letters 1.1' in prompt
+        assert "Current Month's Theme: Resilience" in prompt
+        assert "Previous quotes and reflections" not in prompt
+
+    def test_system_prompt_is_static(self):
+        """Test that the static system prompt holds the instructions and JSON format."""
+        assert '"understanding": "' in SYSTEM_PROMPT
+        assert "THEMATIC FOUNDATION:" in SYSTEM_PROMPT
+        assert "$" not in SYSTEM_PROMPT
+
+    def test_build_reflection_prompt_with_context(self):
+        """Test that every previous reflection is included in order."""
+        previous = [
+            {"date": "2025-01-01", "quote": "First", "attribution": "Epictetus - Enchiridion 1",
+             "reflection": "Reflection one"},
+            {"date": "2025-01-02", "quote": "Second", "attribution": "Seneca - Letters 2",
+             "reflection": "Reflection two"},
+        ]
+        prompt = build_reflection_prompt("Quote text.", "Seneca - Letters 1.1", "Resilience", previous)
+
+        assert prompt.startswith("Previous quotes and reflections from this month:")
+        assert prompt.index("Reflection one") < prompt.index("Reflection two")
+        assert "Date: 2025-01-02" in prompt
+
+    def test_iter_sse_text_collects_text_deltas(self):
+        """Test that text deltas are yielded even when events span chunks."""
+        stream = (
+            b'event: message_start\ndata: {"type": "message_start", "message": {}}\n\n'
+            b'event: content_block_delta\n'
+            b'data: {"type": "content_block_delta", "index": 0, '
+            b'"delta": {"type": "text_delta", "text": "{\\"under"}}\n\n'
+            b'event: content_block_delta\n'
+            b'data: {"type": "content_block_delta", "index": 0, '
+            b'"delta": {"type": "text_delta", "text": "standing\\""}}\n\n'
+            b'event: message_stop\ndata: {"type": "message_stop"}\n\n'
+        )
+        chunks = [stream[i:i + 7] for i in range(0, len(stream), 7)]
+
+        assert "".join(_iter_sse_text(chunks)) == '{"understanding"'
+
+    def test_iter_sse_text_flushes_final_line_without_newline(self):
+        """Test that a last data line cut off before its newline is still read."""
+        stream = [
+            b'data: {"type": "content_block_delta", "index": 0, '
+            b'"delta": {"type": "text_delta", "text": "first "}}\n\n',
+            b'data: {"type": "content_block_delta", "index": 0, '
+            b'"delta": {"type": "text_delta", "text": "last"}}'
+        ]
+
+        assert "".join(_iter_sse_text(stream)) == "first last"
+
+    def test_iter_sse_text_drops_truncated_final_event(self):
+        """Test that a final event cut off mid-JSON is discarded, not raised."""
+        stream = [
+            b'data: {"type": "content_block_delta", "index": 0, '
+            b'"delta": {"type": "text_delta", "text": "kept"}}\n\n',
+            b'data: {"type": "content_block_delta", "ind'
+        ]
+
+        assert "".join(_iter_sse_text(stream)) == "kept"
+
+    def test_iter_sse_text_raises_on_error_event(self):
+        """Test that an error event in the stream raises."""
+        stream = [b'event: error\ndata: {"type": "error", "error": {"type": "overloaded_error"}}\n\n']
+
+        with pytest.raises(Exception):
+            list(_iter_sse_text(stream))
+
+    def test_parse_batch_results_orders_by_custom_id(self):
+        """Test that batch results map back to request order, with None for failures."""
+        succeeded = (
+            '{"custom_id": "1", "result": {"type": "succeeded", "message": '
+            '{"content": [{"type": "text", "text": %s}]}}}'
+        ) % json.dumps(RAW_JSON)
+        errored = '{"custom_id": "0", "result": {"type": "errored", "error": {"type": "overloaded_error"}}}'
+
+        reflections = _parse_batch_results([errored.encode(), succeeded.encode(), b""], 2)
+
+        assert reflections[0] is None
+        assert reflections[1]["understanding"] == "Understanding text."
@@ -0,0 +1,148 @@
+"""Unit tests for api_handler module."""
+
+import pytest
+
+import api_handler
+from api_handler import (
+    build_history_index,
+    create_response,
+    find_reflection_by_date,
+    format_reflection_response,
+    load_history_index
+)
+from quote_tracker import QuoteTracker
+from themes import get_monthly_theme
+
+
+class TestApiHandler:
+    """Test cases for the reflections API helpers."""
+
+    def test_find_reflection_by_date(self):
+        """Test looking up entries through the date index."""
+        history = {
+            "quotes": [
+                {"date": "2025-01-01", "quote": "First"},
+                {"date": "2025-01-02", "quote": "Second"}
+            ]
+        }
+        index = build_history_index(history)
+
+        assert find_reflection_by_date(index, "2025-01-02")["quote"] == "Second"
+        assert find_reflection_by_date(index, "2025-01-03") is None
+
+    def test_build_history_index_keeps_first_duplicate(self):
+        """Test that the earliest entry wins when a date was recorded twice."""
+        history = {
+            "quotes": [
+                {"date": "2025-01-01", "quote": "Original"},
+                {"date": "2025-01-01", "quote": "Rerun"}
+            ]
+        }
+
+        assert build_history_index(history)["2025-01-01"]["quote"] == "Original"
+
+    def test_build_history_index_empty(self):
+        """Test indexing an empty history."""
+        assert build_history_index({}) == {}
+
+    def test_create_response_cache_headers(self):
+        """Test Cache-Control for cacheable and uncached responses."""
+        cached = create_response(200, {"ok": True}, cache_seconds=300)
+        uncached = create_response(404, {"error": "missing"})
+
+        assert cached["headers"]["Cache-Control"] == "public, max-age=300"
+        assert uncached["headers"]["Cache-Control"] == "no-store"
+        assert cached["headers"]["Access-Control-Allow-Origin"] == "*"
+
+    def test_format_reflection_response_monthly_theme(self):
+        """Test that the monthly theme comes from the entry's date."""
+        entry = {
+            "date": "2025-03-15",
+            "quote": "Quote",
+            "attribution": "Seneca - Letters 1",
+            "theme": "Theme",
+            "reflection": "Reflection"
+        }
+        response = format_reflection_response(entry)
+
+        assert response["date"] == "2025-03-15"
+        assert response["monthlyTheme"]["name"] == get_monthly_theme(3)["name"]
+
+    @pytest.mark.parametrize("requested", ["2025-W01-1", "20250101", "2025-1-01"])
+    def test_non_calendar_date_is_rejected(self, requested, monkeypatch):
+        """Test that only YYYY-MM-DD dates are accepted in the path."""
+        monkeypatch.setenv("BUCKET_NAME", "test-bucket")
+        monkeypatch.setattr(api_handler, "load_history_index", lambda bucket_name: {})
+
+        response = api_handler.lambda_handler({"httpMethod": "GET", "path": f"/reflection/{requested}"}, None)
+
+        assert response["statusCode"] == 400
+
+
+class StoredHistory:
+    """Stands in for the history object behind QuoteTracker's HEAD and GET calls."""
+
+    def __init__(self, etag, quotes):
+        self.etag = etag
+        self.quotes = quotes
+        self.loads = 0
+
+    def get_history_etag(self):
+        return self.etag
+
+    def load_history(self):
+        self.loads += 1
+        return {"quotes": list(self.quotes)}
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Route QuoteTracker's S3 reads to a StoredHistory and revalidate on every call."""
+    history = StoredHistory('"v1"', [{"date": "2025-01-01", "quote": "First"}])
+    monkeypatch.setattr(QuoteTracker, "get_history_etag", lambda tracker: history.get_history_etag())
+    monkeypatch.setattr(QuoteTracker, "load_history", lambda tracker: history.load_history())
+    # A zero TTL makes every call go through the ETag check
+    monkeypatch.setattr(api_handler, "HISTORY_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(api_handler, "_HISTORY_CACHE", {})
+    return history
+
+
+class TestLoadHistoryIndex:
+    """Test cases for the cached history index and its ETag revalidation."""
+
+    def test_unchanged_etag_reuses_index(self, stored):
+        """Test that a matching ETag keeps the cached index without a download."""
+        first = load_history_index("test-bucket")
+        second = load_history_index("test-bucket")
+
+        assert stored.loads == 1
+        assert second is first
+
+    def test_changed_etag_reloads_index(self, stored):
+        """Test that a new ETag downloads and re-indexes the history."""
+        load_history_index("test-bucket")
+        stored.etag = '"v2"'
+        stored.quotes.append({"date": "2025-01-02", "quote": "Second"})
+
+        index = load_history_index("test-bucket")
+
+        assert stored.loads == 2
+        assert index["2025-01-02"]["quote"] == "Second"
+
+    def test_missing_history_is_reloaded(self, stored):
+        """Test that a missing object (no ETag) is never treated as unchanged."""
+        stored.etag = None
+        stored.quotes.clear()
+
+        assert load_history_index("test-bucket") == {}
+        assert load_history_index("test-bucket") == {}
+        assert stored.loads == 2
+
+    def test_within_ttl_skips_revalidation(self, stored, monkeypatch):
+        """Test that the cached index is used without a HEAD inside the TTL."""
+        monkeypatch.setattr(api_handler, "HISTORY_CACHE_TTL_SECONDS", 300)
+        load_history_index("test-bucket")
+        stored.etag = '"v2"'
+
+        assert "2025-01-01" in load_history_index("test-bucket")
+        assert stored.loads == 1
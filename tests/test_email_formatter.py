@@ -1,19 +1,15 @@
 """Unit tests for email_formatter module."""
 
-import sys
-from pathlib import Path
-
-# Add lambda directory to path
-lambda_dir = Path(__file__).parent.parent / "lambda"
-sys.path.insert(0, str(lambda_dir))
+import pytest
 
 from email_formatter import (
     format_html_email,
     format_plain_text_email,
     create_email_subject,
-    validate_email_content,
-    format_reflection_paragraphs
+    create_email_subject_for_month,
+    validate_email_content
 )
+from themes import get_theme_name
 
 
 class TestEmailFormatter:
@@ -87,6 +83,14 @@ class TestEmailFormatter:
         assert "Morning Stoic Reflection" in subject
         assert theme in subject
 
+    def test_create_email_subject_for_month(self):
+        """Test per-month subjects match the month's theme."""
+        for month in range(1, 13):
+            assert create_email_subject_for_month(month) == create_email_subject(get_theme_name(month))
+
+        with pytest.raises(ValueError):
+            create_email_subject_for_month(13)
+
     def test_validate_email_content_valid(self):
         """Test validation with valid content."""
         quote = "Test quote"
@@ -137,27 +141,6 @@ class TestEmailFormatter:
         assert validation["has_quote"] is False
         assert validation["is_valid"] is False
 
-    def test_format_reflection_paragraphs_single(self):
-        """Test formatting single paragraph."""
-        reflection = "This is a single paragraph reflection."
-        formatted = format_reflection_paragraphs(reflection)
-
-        assert "<p>" in formatted
-        assert "</p>" in formatted
-        assert reflection in formatted
-
-    def test_format_reflection_paragraphs_multiple(self):
-        """Test formatting multiple paragraphs."""
-        reflection = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
-        formatted = format_reflection_paragraphs(reflection)
-
-        # Should have 3 <p> tags
-        assert formatted.count("<p>") == 3
-        assert formatted.count("</p>") == 3
-        assert "First paragraph" in formatted
-        assert "Second paragraph" in formatted
-        assert "Third paragraph" in formatted
-
     def test_html_escape_special_characters(self):
         """Test that special HTML characters are escaped."""
         quote = "<script>alert('test')</script>"
@@ -175,3 +158,24 @@ class TestEmailFormatter:
         assert "<script>" not in html
         assert "&lt;script&gt;" in html or "alert" not in html
         assert "&amp;" in html or "Test &amp; Author" in html
+
+    def test_format_html_email_progress_width(self):
+        """Test that the progress bar width is set inline from the day of month."""
+        reflection = {"understanding": "U", "connection": "C", "practice": "P"}
+
+        html = format_html_email("Quote", "Seneca - Letters 1", reflection, "Theme",
+                                 day_of_month=15, days_in_month=30)
+
+        assert "Day 15 of 30" in html
+        assert 'class="progress-fill" style="width: 50.0%;"' in html
+        assert "${" not in html
+
+    def test_format_html_email_minified(self):
+        """Test that template formatting whitespace is stripped from the HTML."""
+        reflection = {"understanding": "U", "connection": "C", "practice": "P"}
+
+        html = format_html_email("Quote", "Seneca - Letters 1", reflection, "Theme")
+
+        assert "\n" not in html
+        assert "><div" in html
+        assert ".header h1{" in html
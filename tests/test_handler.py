@@ -0,0 +1,168 @@
+"""Unit tests for handler module."""
+
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+import handler
+
+
+class FakeSES:
+    """Records SES calls; bulk calls listed in fail_batches raise ClientError."""
+
+    def __init__(self, fail_batches=()):
+        self.fail_batches = set(fail_batches)
+        self.bulk_calls = []
+        self.individual_sends = []
+        self.templates = []
+
+    def update_template(self, Template):
+        self.templates.append(Template)
+
+    def send_bulk_templated_email(self, Destinations, **kwargs):
+        batch_number = len(self.bulk_calls)
+        self.bulk_calls.append([d['Destination']['ToAddresses'][0] for d in Destinations])
+        if batch_number in self.fail_batches:
+            raise ClientError({'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}},
+                              'SendBulkTemplatedEmail')
+        return {'Status': [{'Status': 'Success', 'MessageId': 'id'} for _ in Destinations]}
+
+    def send_email(self, Destination, **kwargs):
+        self.individual_sends.append(Destination['ToAddresses'][0])
+        return {'MessageId': 'id'}
+
+
+class EmptyS3:
+    """S3 client with no stored objects that accepts every PUT."""
+
+    def get_object(self, Bucket, Key):
+        raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not found'}}, 'GetObject')
+
+    def put_object(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def ses(monkeypatch):
+    """Patch the handler's shared SES client with a FakeSES."""
+    def install(**kwargs):
+        fake = FakeSES(**kwargs)
+        monkeypatch.setattr(handler, "get_ses_client", lambda: fake)
+        return fake
+    return install
+
+
+def recipients(count):
+    """Build a list of distinct test addresses."""
+    return [f"user{i}@example.com" for i in range(count)]
+
+
+class TestSendEmails:
+    """Test cases for bulk and individual email sending."""
+
+    def test_bulk_send_in_batches(self, ses):
+        """Test that several recipients are sent in bulk batches of 50."""
+        fake = ses()
+        to = recipients(120)
+
+        result = handler.send_emails("from@example.com", to, "Subject", "<p>Hi</p>", "Hi")
+
+        assert result == (120, 0)
+        assert [len(batch) for batch in fake.bulk_calls] == [50, 50, 20]
+        assert fake.individual_sends == []
+        assert fake.templates[0]['HtmlPart'] == "<p>Hi</p>"
+
+    def test_failed_batch_falls_back_without_resending(self, ses):
+        """Test that only a failed batch's recipients are sent individually."""
+        fake = ses(fail_batches={1})
+        to = recipients(120)
+
+        result = handler.send_emails("from@example.com", to, "Subject", "<p>Hi</p>", "Hi")
+
+        assert result == (120, 0)
+        assert sorted(fake.individual_sends) == sorted(to[50:100])
+        # Later batches are still sent in bulk
+        assert len(fake.bulk_calls) == 3
+
+    def test_template_syntax_skips_bulk(self, ses):
+        """Test that content containing '{{' is never sent as an SES template."""
+        fake = ses()
+        to = recipients(3)
+
+        result = handler.send_emails("from@example.com", to, "Subject", "<p>{{ name }}</p>", "Hi")
+
+        assert result == (3, 0)
+        assert fake.bulk_calls == []
+        assert fake.templates == []
+        assert sorted(fake.individual_sends) == to
+
+    def test_single_recipient_sends_individually(self, ses):
+        """Test that one recipient doesn't go through the template path."""
+        fake = ses()
+
+        assert handler.send_emails("from@example.com", ["a@example.com"], "S", "<p>Hi</p>", "Hi") == (1, 0)
+        assert fake.bulk_calls == []
+        assert fake.individual_sends == ["a@example.com"]
+
+
+@pytest.fixture
+def daily_run(ses, monkeypatch):
+    """Set up lambda_handler with fake AWS clients, quote, recipients, and reflection."""
+    ses()
+    s3 = EmptyS3()
+    monkeypatch.setenv("BUCKET_NAME", "test-bucket")
+    monkeypatch.setenv("SENDER_EMAIL", "from@example.com")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key")
+    monkeypatch.setattr(handler, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(handler, "warm_connection", lambda api_key: None)
+    monkeypatch.setattr(handler, "load_recipients_from_s3", lambda bucket_name: ["a@example.com"])
+    monkeypatch.setattr(handler.QuoteLoader, "get_quote_for_date", lambda loader, date: {
+        "quote": "Q", "attribution": "Seneca - Letters 1", "theme": "T"
+    })
+    monkeypatch.setattr(handler, "generate_reflection_only", lambda **kwargs: {
+        "understanding": "U.", "connection": "C.", "practice": "P."
+    })
+    return s3
+
+
+class TestLambdaHandler:
+    """Test cases for the daily handler's wiring."""
+
+    def test_collaborators_share_one_s3_client(self, daily_run, monkeypatch):
+        """Test that the tracker, loader, and cache all get the handler's S3 client."""
+        seen = {}
+
+        def recording(cls):
+            def create(*args, **kwargs):
+                instance = cls(*args, **kwargs)
+                seen[cls.__name__] = instance.s3_client
+                return instance
+            return create
+
+        for name in ("QuoteTracker", "QuoteLoader", "ReflectionCache"):
+            monkeypatch.setattr(handler, name, recording(getattr(handler, name)))
+
+        response = handler.lambda_handler({}, None)
+
+        assert response['statusCode'] == 200
+        assert seen == {"QuoteTracker": daily_run, "QuoteLoader": daily_run, "ReflectionCache": daily_run}
+
+    def test_load_failure_does_not_wait_for_warm_up(self, daily_run, monkeypatch):
+        """Test that a failed S3 load returns without waiting for the TLS warm-up."""
+        handshake_done = threading.Event()
+
+        def fail(bucket_name):
+            raise ValueError("recipients unavailable")
+
+        monkeypatch.setattr(handler, "warm_connection", lambda api_key: handshake_done.wait(5))
+        monkeypatch.setattr(handler, "load_recipients_from_s3", fail)
+
+        started = time.monotonic()
+        response = handler.lambda_handler({}, None)
+        elapsed = time.monotonic() - started
+        handshake_done.set()
+
+        assert response['statusCode'] == 500
+        assert elapsed < 2
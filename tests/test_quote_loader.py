@@ -0,0 +1,79 @@
+"""Unit tests for quote_loader module."""
+
+import pytest
+from datetime import datetime
+
+import quote_loader
+from quote_loader import QuoteLoader, build_quote_index
+
+
+QUOTES_DB = {
+    "january": [
+        {"day": 1, "quote": "Q1", "attribution": "Marcus Aurelius - Meditations 1.1", "theme": "Discipline"},
+        {"day": 2, "quote": "Q2", "attribution": "Seneca - Letters 2", "theme": "Discipline"},
+    ],
+    "february": [
+        {"day": 28, "quote": "Q28", "attribution": "Epictetus - Enchiridion 28", "theme": "Relationships"},
+    ],
+}
+
+
+class TestBuildQuoteIndex:
+    """Test cases for the (month, day) quote index."""
+
+    def test_index_by_month_and_day(self):
+        """Test entries are keyed by month name and day."""
+        index = build_quote_index(QUOTES_DB)
+
+        assert len(index) == 3
+        assert index[("january", 2)]["quote"] == "Q2"
+        assert index[("february", 28)]["quote"] == "Q28"
+
+    def test_first_duplicate_wins(self):
+        """Test the first entry for a repeated day is kept."""
+        data = {"march": [
+            {"day": 5, "quote": "first", "attribution": "A", "theme": "T"},
+            {"day": 5, "quote": "second", "attribution": "A", "theme": "T"},
+        ]}
+
+        assert build_quote_index(data)[("march", 5)]["quote"] == "first"
+
+
+class TestGetQuoteForDate:
+    """Test cases for date lookups against a cached database."""
+
+    def setup_method(self):
+        quote_loader._QUOTES_DB_CACHE["test-bucket"] = QUOTES_DB
+        quote_loader._QUOTE_INDEX_CACHE["test-bucket"] = build_quote_index(QUOTES_DB)
+
+    def teardown_method(self):
+        quote_loader._QUOTES_DB_CACHE.pop("test-bucket", None)
+        quote_loader._QUOTE_INDEX_CACHE.pop("test-bucket", None)
+
+    def test_get_quote(self):
+        """Test a quote is returned for a known date."""
+        quote = QuoteLoader("test-bucket").get_quote_for_date(datetime(2025, 1, 2))
+
+        assert quote == {
+            "quote": "Q2",
+            "attribution": "Seneca - Letters 2",
+            "theme": "Discipline",
+        }
+
+    def test_leap_day_uses_february_28(self):
+        """Test February 29 falls back to the February 28 quote."""
+        quote = QuoteLoader("test-bucket").get_quote_for_date(datetime(2024, 2, 29))
+
+        assert quote["quote"] == "Q28"
+
+    def test_missing_day_raises(self):
+        """Test a missing day raises an exception."""
+        with pytest.raises(Exception, match="January 3"):
+            QuoteLoader("test-bucket").get_quote_for_date(datetime(2025, 1, 3))
+
+    def test_cached_lookup_creates_no_s3_client(self):
+        """Test that the S3 client is only created when S3 is actually read."""
+        loader = QuoteLoader("test-bucket")
+        loader.get_quote_for_date(datetime(2025, 1, 2))
+
+        assert loader._s3_client is None
@@ -1,24 +1,50 @@
 """Unit tests for quote_tracker module."""
 
-import sys
-from pathlib import Path
+import io
+import pytest
 from datetime import datetime, timedelta
 
-# Add lambda directory to path
-lambda_dir = Path(__file__).parent.parent / "lambda"
-sys.path.insert(0, str(lambda_dir))
+from botocore.exceptions import ClientError
 
-from quote_tracker import QuoteTracker
+import quote_tracker
+from quote_tracker import QuoteTracker, decode_history, encode_history
+
+
+@pytest.fixture(scope="module")
+def today():
+    """Fixed 'current' date so date-relative tests are deterministic."""
+    return datetime(2025, 10, 22)
+
+
+class FakeS3:
+    """In-memory stand-in for the S3 calls QuoteTracker makes."""
+
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+        self.puts = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not found'}}, 'GetObject')
+        return {'Body': io.BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.puts.append(Key)
+        self.objects[Key] = Body
+
+
+@pytest.fixture
+def tracker():
+    """QuoteTracker for a test bucket (the S3 client is never called)."""
+    return QuoteTracker("test-bucket")
 
 
 class TestQuoteTracker:
     """Test cases for quote tracking functionality."""
 
-    def test_add_quote(self):
-        """Test adding a quote to history."""
-        history = {"quotes": []}
-        tracker = QuoteTracker("test-bucket")
-
+    @pytest.mark.parametrize("history", [{"quotes": []}, {}], ids=["empty_quotes", "no_quotes_key"])
+    def test_add_quote(self, tracker, history):
+        """Test adding a quote to an empty history, with or without a 'quotes' key."""
         quote = "You have power over your mind - not outside events."
         attribution = "Marcus Aurelius - Meditations 6.8"
         reflection = "This is a test reflection about the power of the mind and how we can control our thoughts and reactions to external events."
@@ -40,9 +66,8 @@ class TestQuoteTracker:
         assert updated["quotes"][0]["reflection"] == reflection
         assert updated["quotes"][0]["theme"] == theme
 
-    def test_get_current_month_quotes(self):
+    def test_get_current_month_quotes(self, tracker, today):
         """Test getting quotes from current month."""
-        today = datetime.now()
         this_month = today.replace(day=5)
         last_month = today - timedelta(days=35)
 
@@ -54,14 +79,14 @@ class TestQuoteTracker:
         history = {
             "quotes": [
                 {
-                    "date": this_month.strftime("%Y-%m-%d"),
+                    "date": this_month.date().isoformat(),
                     "quote": quote1,
                     "attribution": "Marcus Aurelius - Meditations 6.8",
                     "reflection": reflection1,
                     "theme": "Test"
                 },
                 {
-                    "date": last_month.strftime("%Y-%m-%d"),
+                    "date": last_month.date().isoformat(),
                     "quote": quote2,
                     "attribution": "Marcus Aurelius - Meditations 5.20",
                     "reflection": reflection2,
@@ -70,7 +95,6 @@ class TestQuoteTracker:
             ]
         }
 
-        tracker = QuoteTracker("test-bucket")
         current_month = tracker.get_current_month_quotes(history, today)
 
         # Should only get quotes from this month
@@ -78,17 +102,15 @@ class TestQuoteTracker:
         assert current_month[0]["quote"] == quote1
         assert current_month[0]["reflection"] == reflection1
 
-    def test_get_current_month_quotes_empty_history(self):
+    def test_get_current_month_quotes_empty_history(self, tracker, today):
         """Test getting current month quotes from empty history."""
         history = {"quotes": []}
-        tracker = QuoteTracker("test-bucket")
-        today = datetime.now()
 
         current_month = tracker.get_current_month_quotes(history, today)
 
         assert len(current_month) == 0
 
-    def test_get_quote_count(self):
+    def test_get_quote_count(self, tracker):
         """Test getting quote count."""
         history = {
             "quotes": [
@@ -98,78 +120,242 @@ class TestQuoteTracker:
             ]
         }
 
-        tracker = QuoteTracker("test-bucket")
         count = tracker.get_quote_count(history)
 
         assert count == 3
 
-    def test_cleanup_old_quotes(self):
+    def test_cleanup_old_quotes(self, tracker, today):
         """Test cleanup of old quotes."""
-        today = datetime.now()
         old_date = today - timedelta(days=500)
         recent_date = today - timedelta(days=100)
 
         history = {
             "quotes": [
                 {
-                    "date": old_date.strftime("%Y-%m-%d"),
+                    "date": old_date.date().isoformat(),
                     "attribution": "Old Quote",
                     "theme": "Test"
                 },
                 {
-                    "date": recent_date.strftime("%Y-%m-%d"),
+                    "date": recent_date.date().isoformat(),
                     "attribution": "Recent Quote",
                     "theme": "Test"
                 }
             ]
         }
 
-        tracker = QuoteTracker("test-bucket")
-        cleaned = tracker.cleanup_old_quotes(history, keep_days=400)
+        cleaned = tracker.cleanup_old_quotes(history, keep_days=400, current_date=today)
 
         # Should only keep the recent quote
         assert len(cleaned["quotes"]) == 1
         assert cleaned["quotes"][0]["attribution"] == "Recent Quote"
 
-    def test_cleanup_old_quotes_empty(self):
+    def test_cleanup_old_quotes_empty(self, tracker, today):
         """Test cleanup with no quotes to remove."""
-        today = datetime.now()
         recent_date = today - timedelta(days=10)
 
         history = {
             "quotes": [
                 {
-                    "date": recent_date.strftime("%Y-%m-%d"),
+                    "date": recent_date.date().isoformat(),
                     "attribution": "Recent Quote",
                     "theme": "Test"
                 }
             ]
         }
 
-        tracker = QuoteTracker("test-bucket")
-        cleaned = tracker.cleanup_old_quotes(history, keep_days=400)
+        cleaned = tracker.cleanup_old_quotes(history, keep_days=400, current_date=today)
 
         # Should keep the quote
         assert len(cleaned["quotes"]) == 1
 
-    def test_add_quote_to_empty_history(self):
-        """Test adding a quote when history doesn't have 'quotes' key."""
-        history = {}
-        tracker = QuoteTracker("test-bucket")
+    def test_month_lookup_does_not_reorder_history(self, tracker, today):
+        """Test that the date-range lookups leave an out-of-order history untouched."""
+        quotes = [
+            {"date": "2025-10-05", "attribution": "This Month", "theme": "Test"},
+            {"date": "2025-09-17", "attribution": "Last Month", "theme": "Test"}
+        ]
+        history = {"quotes": list(quotes)}
 
-        quote = "Test quote text"
-        attribution = "Test Attribution"
-        reflection = "Test reflection text"
-        theme = "Test Theme"
+        month_quotes = tracker.get_current_month_quotes(history, today)
+        scan = tracker.scan_history(history, today)
 
-        updated = tracker.add_quote(
-            history,
-            "2025-10-22",
-            quote,
-            attribution,
-            reflection,
-            theme
-        )
+        assert [q["attribution"] for q in month_quotes] == ["This Month"]
+        assert [q["attribution"] for q in scan.month_quotes] == ["This Month"]
+        assert history["quotes"] == quotes
 
-        assert "quotes" in updated
-        assert len(updated["quotes"]) == 1
+    def test_scan_history_reuses_sorted_list(self, tracker, today):
+        """Test that scanning a sorted history in the retention window copies nothing."""
+        history = {"quotes": [{"date": "2025-10-05", "attribution": "A", "theme": "Test"}]}
+
+        scan = tracker.scan_history(history, today)
+
+        assert scan.kept is history["quotes"]
+
+    def test_cleanup_old_quotes_unsorted(self, tracker, today):
+        """Test that cleanup keeps recent entries listed before old ones."""
+        history = {
+            "quotes": [
+                {"date": (today - timedelta(days=10)).date().isoformat(), "attribution": "Recent", "theme": "Test"},
+                {"date": (today - timedelta(days=500)).date().isoformat(), "attribution": "Old", "theme": "Test"}
+            ]
+        }
+
+        quotes = history["quotes"]
+
+        cleaned = tracker.cleanup_old_quotes(history, keep_days=400, current_date=today)
+
+        assert [q["attribution"] for q in cleaned["quotes"]] == ["Recent"]
+        assert cleaned["quotes"] is quotes
+
+    @pytest.mark.parametrize("current_date, expected", [
+        (datetime(2025, 10, 22), ["2025-10-21"]),
+        (datetime(2025, 10, 22, 7, 30), ["2025-10-21", "2025-10-22"]),
+    ], ids=["midnight", "morning"])
+    def test_get_current_month_quotes_day_boundary(self, tracker, current_date, expected):
+        """Test that only entries dated before current_date (as midnight) are returned."""
+        history = {
+            "quotes": [
+                {"date": "2025-10-21", "attribution": "Yesterday", "theme": "Test"},
+                {"date": "2025-10-22", "attribution": "Today", "theme": "Test"},
+                {"date": "2025-10-23", "attribution": "Tomorrow", "theme": "Test"}
+            ]
+        }
+
+        month_quotes = tracker.get_current_month_quotes(history, current_date)
+
+        assert [q["date"] for q in month_quotes] == expected
+
+    @pytest.mark.parametrize("current_date, expected", [
+        (datetime(2025, 10, 22), ["2024-09-17", "2024-09-18"]),
+        (datetime(2025, 10, 22, 7, 30), ["2024-09-18"]),
+    ], ids=["midnight", "morning"])
+    def test_cleanup_keeps_entry_on_cutoff(self, tracker, current_date, expected):
+        """Test that an entry dated exactly on a midnight cutoff is kept."""
+        # 400 days before 2025-10-22 is 2024-09-17
+        history = {
+            "quotes": [
+                {"date": "2024-09-16", "attribution": "Before", "theme": "Test"},
+                {"date": "2024-09-17", "attribution": "Cutoff", "theme": "Test"},
+                {"date": "2024-09-18", "attribution": "After", "theme": "Test"}
+            ]
+        }
+
+        scan = tracker.scan_history(history, current_date, keep_days=400)
+        cleaned = tracker.cleanup_old_quotes(history, keep_days=400, current_date=current_date)
+
+        assert [q["date"] for q in scan.kept] == expected
+        assert [q["date"] for q in cleaned["quotes"]] == expected
+
+    def test_scan_history(self, tracker, today):
+        """Test the history scan matches the individual methods."""
+        history = {
+            "quotes": [
+                {"date": (today - timedelta(days=500)).date().isoformat(), "attribution": "Old", "theme": "Test"},
+                {"date": (today - timedelta(days=40)).date().isoformat(), "attribution": "Recent", "theme": "Test"},
+                {"date": today.replace(day=1).date().isoformat(), "attribution": "This Month", "theme": "Test"}
+            ]
+        }
+
+        scan = tracker.scan_history(history, today, keep_days=400)
+
+        assert scan.month_quotes == tracker.get_current_month_quotes(history, today)
+        assert scan.kept == tracker.cleanup_old_quotes(dict(history), keep_days=400, current_date=today)["quotes"]
+        assert [q["attribution"] for q in scan.kept] == ["Recent", "This Month"]
+
+    def test_add_quote_keeps_history_sorted(self, tracker):
+        """Test that an out-of-order date is inserted in date order."""
+        history = {
+            "quotes": [
+                {"date": "2025-01-01", "attribution": "Test 1", "theme": "Test"},
+                {"date": "2025-01-03", "attribution": "Test 3", "theme": "Test"}
+            ]
+        }
+
+        tracker.add_quote(history, "2025-01-02", "Quote", "Test 2", "Reflection", "Test")
+        tracker.add_quote(history, "2025-01-04", "Quote", "Test 4", "Reflection", "Test")
+
+        assert [q["date"] for q in history["quotes"]] == [
+            "2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"
+        ]
+
+    def test_encode_decode_history_roundtrip(self):
+        """Test that history is stored compressed and decodes back unchanged."""
+        history = {
+            "quotes": [
+                {"date": "2025-01-01", "attribution": "Seneca - Letters 1", "theme": "Test",
+                 "quote": "Hold every hour in your grasp.", "reflection": "Résumé — ünïcode"}
+            ]
+        }
+
+        body = encode_history(history)
+
+        assert body[:2] == b"\x1f\x8b"
+        assert decode_history(body) == history
+        # Deterministic output lets save_history skip unchanged histories
+        assert encode_history(history) == body
+
+    def test_decode_history_plain_json(self):
+        """Test that uncompressed history files still load."""
+        body = b'{"quotes": [{"date": "2025-01-01", "attribution": "Test", "theme": "Test"}]}'
+
+        assert decode_history(body)["quotes"][0]["date"] == "2025-01-01"
+
+    def test_has_iso_date(self):
+        """Test the load-time check for entries with a YYYY-MM-DD date."""
+        assert quote_tracker._has_iso_date({"date": "2025-01-01"})
+        assert not quote_tracker._has_iso_date({"attribution": "No Date"})
+        assert not quote_tracker._has_iso_date({"date": "01/01/2025"})
+        assert not quote_tracker._has_iso_date({"date": 20250101})
+        assert not quote_tracker._has_iso_date("2025-01-01")
+
+    def test_load_history_sorts_by_date(self, tracker):
+        """Test that a hand-edited, out-of-order history is sorted at load."""
+        stored = {
+            "quotes": [
+                {"date": "2025-10-05", "attribution": "This Month", "theme": "Test"},
+                {"date": "2025-09-17", "attribution": "Last Month", "theme": "Test"},
+                {"date": "2024-06-01", "attribution": "Old", "theme": "Test"}
+            ]
+        }
+        tracker.s3_client = FakeS3({tracker.history_key: encode_history(stored)})
+
+        history = tracker.load_history()
+
+        assert [q["date"] for q in history["quotes"]] == ["2024-06-01", "2025-09-17", "2025-10-05"]
+        scan = tracker.scan_history(history, datetime(2025, 10, 22), keep_days=400)
+        assert [q["attribution"] for q in scan.month_quotes] == ["This Month"]
+        assert [q["attribution"] for q in scan.kept] == ["Last Month", "This Month"]
+
+    def test_save_unchanged_history_skips_put(self, tracker):
+        """Test that saving the history exactly as loaded makes no PUT."""
+        stored = {"quotes": [{"date": "2025-10-01", "attribution": "Test", "theme": "Test"}]}
+        tracker.s3_client = FakeS3({tracker.history_key: encode_history(stored)})
+
+        tracker.save_history(tracker.load_history())
+
+        assert tracker.s3_client.puts == []
+
+    def test_save_changed_history_puts_and_updates_digest(self, tracker):
+        """Test that a changed history is written once and then counts as saved."""
+        stored = {"quotes": [{"date": "2025-10-01", "attribution": "Test", "theme": "Test"}]}
+        tracker.s3_client = FakeS3({tracker.history_key: encode_history(stored)})
+
+        history = tracker.load_history()
+        tracker.add_quote(history, "2025-10-02", "Quote", "Test 2", "Reflection", "Test")
+        tracker.save_history(history)
+        tracker.save_history(history)
+
+        assert tracker.s3_client.puts == [tracker.history_key]
+        assert decode_history(tracker.s3_client.objects[tracker.history_key]) == history
+
+    def test_save_after_missing_history_puts(self, tracker):
+        """Test that the first save after NoSuchKey writes the new history."""
+        tracker.s3_client = FakeS3()
+
+        history = tracker.load_history()
+        assert history == {"quotes": []}
+        tracker.add_quote(history, "2025-10-01", "Quote", "Test", "Reflection", "Test")
+        tracker.save_history(history)
+
+        assert tracker.s3_client.puts == [tracker.history_key]
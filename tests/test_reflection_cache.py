@@ -0,0 +1,89 @@
+"""Unit tests for reflection_cache module."""
+
+import json
+
+import anthropic_client
+from anthropic_client import generate_reflection_only
+from reflection_cache import ReflectionCache
+
+
+REFLECTION = {
+    "understanding": "Understanding text.",
+    "connection": "Connection text.",
+    "practice": "Practice text."
+}
+
+
+class StubCache:
+    """In-memory stand-in for ReflectionCache that records puts."""
+
+    make_key = staticmethod(ReflectionCache.make_key)
+
+    def __init__(self, stored=None):
+        self.stored = dict(stored or {})
+        self.puts = []
+
+    def get(self, key):
+        return self.stored.get(key)
+
+    def put(self, key, reflection):
+        self.puts.append(key)
+        self.stored[key] = reflection
+
+
+class TestReflectionCache:
+    """Test cases for reflection cache keys."""
+
+    def test_make_key_is_deterministic(self):
+        """Test that identical requests map to the same key."""
+        key = ReflectionCache.make_key("model", "system", "prompt")
+
+        assert key == ReflectionCache.make_key("model", "system", "prompt")
+        assert len(key) == 32
+
+    def test_make_key_distinguishes_parts(self):
+        """Test that changing or re-splitting parts changes the key."""
+        key = ReflectionCache.make_key("model", "system", "prompt")
+
+        assert key != ReflectionCache.make_key("model", "system", "other prompt")
+        assert ReflectionCache.make_key("ab", "c") != ReflectionCache.make_key("a", "bc")
+
+    def test_reuses_given_s3_client(self):
+        """Test that a passed-in S3 client is used instead of creating one."""
+        client = object()
+
+        assert ReflectionCache("test-bucket", s3_client=client).s3_client is client
+
+
+class TestGenerateReflectionCaching:
+    """Test cases for the cache lookups in generate_reflection_only."""
+
+    def test_cache_hit_skips_api(self, monkeypatch):
+        """Test that a cached reflection is returned without calling the API."""
+        def fail(*args, **kwargs):
+            raise AssertionError("API should not be called on a cache hit")
+
+        monkeypatch.setattr(anthropic_client, "stream_anthropic_api", fail)
+        monkeypatch.setattr(anthropic_client, "_HTTP", None)
+        prompt = anthropic_client.build_reflection_prompt("Quote", "Seneca - Letters 1", "Theme")
+        key = ReflectionCache.make_key(anthropic_client.MODEL, anthropic_client.SYSTEM_PROMPT, prompt)
+        cache = StubCache({key: REFLECTION})
+
+        reflection = generate_reflection_only("Quote", "Seneca - Letters 1", "Theme", "key", cache=cache)
+
+        assert reflection == REFLECTION
+        assert cache.puts == []
+
+    def test_cache_miss_stores_reflection(self, monkeypatch):
+        """Test that a generated reflection is stored under the request's key."""
+        monkeypatch.setattr(
+            anthropic_client, "stream_anthropic_api",
+            lambda *args, **kwargs: iter([json.dumps(REFLECTION)])
+        )
+        cache = StubCache()
+
+        reflection = generate_reflection_only("Quote", "Seneca - Letters 1", "Theme", "key", cache=cache)
+
+        assert reflection == REFLECTION
+        assert len(cache.puts) == 1
+        assert cache.stored[cache.puts[0]] == REFLECTION
@@ -1,14 +1,8 @@
 """Unit tests for themes module."""
 
 import pytest
-import sys
-from pathlib import Path
 
-# Add lambda directory to path
-lambda_dir = Path(__file__).parent.parent / "lambda"
-sys.path.insert(0, str(lambda_dir))
-
-from themes import get_monthly_theme, get_theme_name, get_theme_description
+from themes import MONTHLY_THEMES, get_monthly_theme, get_theme_name, get_theme_description
 
 
 class TestThemes:
@@ -52,11 +46,16 @@ class TestThemes:
         description = get_theme_description(6)
         assert "wisdom" in description.lower()
 
-    def test_all_months_have_themes(self):
-        """Test that all 12 months have valid themes."""
-        for month in range(1, 13):
-            theme = get_monthly_theme(month)
-            assert "name" in theme
-            assert "description" in theme
-            assert len(theme["name"]) > 0
-            assert len(theme["description"]) > 0
+    @pytest.mark.parametrize("month", range(1, 13))
+    def test_month_has_theme(self, month):
+        """Test that each of the 12 months has a valid theme."""
+        theme = get_monthly_theme(month)
+        assert "name" in theme
+        assert "description" in theme
+        assert len(theme["name"]) > 0
+        assert len(theme["description"]) > 0
+
+    @pytest.mark.parametrize("month", [1, 12])
+    def test_monthly_theme_is_not_copied(self, month):
+        """Test that lookups return the MONTHLY_THEMES entry itself."""
+        assert get_monthly_theme(month) is MONTHLY_THEMES[month]
@@ -0,0 +1,82 @@
+"""Unit tests for validate_quotes script."""
+
+import json
+
+import pytest
+
+from validate_quotes import EXPECTED_DAYS, fast_fail_from_env, validate_quotes_database
+
+
+@pytest.fixture
+def complete_db():
+    """A structurally complete database with one entry per day."""
+    return {
+        month: [
+            {"day": day, "theme": "Theme", "quote": "Quote", "attribution": "Seneca - Letters 1"}
+            for day in range(1, count + 1)
+        ]
+        for month, count in EXPECTED_DAYS
+    }
+
+
+@pytest.fixture
+def broken_db(complete_db):
+    """Errors in three months: a duplicate day, a missing month, a missing field."""
+    complete_db["february"].append(dict(complete_db["february"][4]))
+    del complete_db["april"]
+    del complete_db["june"][2]["quote"]
+    return complete_db
+
+
+def write_db(tmp_path, db):
+    """Write a database to a temporary JSON file and return its path."""
+    path = tmp_path / "quotes.json"
+    path.write_text(json.dumps(db))
+    return str(path)
+
+
+class TestValidateQuotesDatabase:
+    """Test cases for quotes database validation."""
+
+    def test_complete_database(self, tmp_path, complete_db):
+        """Test that a complete database passes."""
+        result = validate_quotes_database(write_db(tmp_path, complete_db))
+
+        assert result["complete"]
+        assert result["total_quotes"] == result["expected_quotes"] == 365
+
+    def test_default_collects_every_error(self, tmp_path, broken_db):
+        """Test that the full pass reports errors from every month."""
+        result = validate_quotes_database(write_db(tmp_path, broken_db))
+
+        assert not result["complete"]
+        assert result["duplicate_days"] == [("february", 5)]
+        assert result["missing_days"] == [("april", day) for day in range(1, 31)]
+        assert result["missing_fields"] == [("june", 3, "quote")]
+
+    def test_fast_fail_stops_at_first_error(self, tmp_path, broken_db):
+        """Test that fast-fail returns after the first broken month."""
+        result = validate_quotes_database(write_db(tmp_path, broken_db), fast_fail=True)
+
+        assert not result["complete"]
+        assert result["duplicate_days"] == [("february", 5)]
+        assert result["missing_days"] == []
+        assert result["missing_fields"] == []
+        # Only January and February were checked
+        assert result["total_quotes"] == 31 + 29
+
+    @pytest.mark.parametrize("value, expected", [
+        ("1", True), ("true", True), ("YES", True),
+        ("0", False), ("false", False), ("", False),
+    ])
+    def test_fast_fail_from_env(self, monkeypatch, value, expected):
+        """Test that CI_FAST_FAIL is parsed explicitly, so "0" leaves it off."""
+        monkeypatch.setenv("CI_FAST_FAIL", value)
+
+        assert fast_fail_from_env() is expected
+
+    def test_fast_fail_from_env_unset(self, monkeypatch):
+        """Test that fast-fail is off when CI_FAST_FAIL isn't set."""
+        monkeypatch.delenv("CI_FAST_FAIL", raising=False)
+
+        assert fast_fail_from_env() is False
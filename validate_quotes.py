@@ -6,84 +6,112 @@ Checks that all 365 days are present and properly formatted.
 """
 
 import json
+import os
 import sys
+from collections import Counter
 from pathlib import Path
 
-
-def validate_quotes_database(file_path: str) -> dict:
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed packages
+    orjson = None  # type: ignore[assignment]
+
+REQUIRED_FIELDS = frozenset(('day', 'theme', 'quote', 'attribution'))
+
+# Days per month in the database (February has 28; Feb 29 reuses Feb 28)
+EXPECTED_DAYS = (
+    ('january', 31),
+    ('february', 28),
+    ('march', 31),
+    ('april', 30),
+    ('may', 31),
+    ('june', 30),
+    ('july', 31),
+    ('august', 31),
+    ('september', 30),
+    ('october', 31),
+    ('november', 30),
+    ('december', 31),
+)
+EXPECTED_TOTAL = sum(count for _, count in EXPECTED_DAYS)
+
+
+def validate_quotes_database(file_path: str, fast_fail: bool = False) -> dict:
     """
     Validate the quotes database contains all 365 days.
 
+    Args:
+        file_path: Path to the quotes database JSON
+        fast_fail: Stop after the first month with missing or duplicate days.
+            The result then only covers the months checked so far.
+
     Returns:
         Dictionary with validation results
     """
-    with open(file_path, 'r') as f:
-        quotes_db = json.load(f)
-
-    expected_days = {
-        'january': 31,
-        'february': 28,
-        'march': 31,
-        'april': 30,
-        'may': 31,
-        'june': 30,
-        'july': 31,
-        'august': 31,
-        'september': 30,
-        'october': 31,
-        'november': 30,
-        'december': 31
-    }
+    raw = Path(file_path).read_bytes()
+    quotes_db = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     total_quotes = 0
-    missing_days = []
-    duplicate_days = []
-    missing_fields = []
+    missing_days: list[tuple[str, int]] = []
+    duplicate_days: list[tuple[str, int]] = []
+    missing_fields: list[tuple[str, int | str, str]] = []
 
-    for month, expected_count in expected_days.items():
+    for month, expected_count in EXPECTED_DAYS:
         if month not in quotes_db:
-            missing_days.extend([(month, day) for day in range(1, expected_count + 1)])
+            missing_days.extend((month, day) for day in range(1, expected_count + 1))
+            if fast_fail:
+                break
             continue
 
         month_quotes = quotes_db[month]
         total_quotes += len(month_quotes)
 
-        # Check for all days present
-        days_found = set()
+        day_counts: Counter[int] = Counter()
         for quote_entry in month_quotes:
+            day = quote_entry.get('day')
+            day_counts[day] += 1
+
             # Validate required fields
-            required_fields = ['day', 'theme', 'quote', 'attribution']
-            for field in required_fields:
-                if field not in quote_entry:
-                    missing_fields.append((month, quote_entry.get('day', '?'), field))
+            missing = REQUIRED_FIELDS.difference(quote_entry)
+            if missing:
+                shown_day = day if day is not None else '?'
+                missing_fields.extend((month, shown_day, field) for field in sorted(missing))
 
-            day = quote_entry.get('day')
-            if day in days_found:
-                duplicate_days.append((month, day))
-            days_found.add(day)
+        # Check for all days present, and each present only once
+        duplicate_days.extend((month, day) for day, count in day_counts.items() if count > 1)
+        expected = set(range(1, expected_count + 1))
+        missing_days.extend((month, day) for day in sorted(expected - day_counts.keys()))
 
-        # Find missing days
-        for day in range(1, expected_count + 1):
-            if day not in days_found:
-                missing_days.append((month, day))
+        if fast_fail and (missing_days or duplicate_days):
+            break
 
     is_complete = (
         len(missing_days) == 0 and
         len(duplicate_days) == 0 and
         len(missing_fields) == 0 and
-        total_quotes == 365
+        total_quotes == EXPECTED_TOTAL
     )
 
     return {
         'complete': is_complete,
         'total_quotes': total_quotes,
-        'expected_quotes': 365,
+        'expected_quotes': EXPECTED_TOTAL,
         'missing_days': missing_days,
         'duplicate_days': duplicate_days,
         'missing_fields': missing_fields
     }
 
 
+def fast_fail_from_env() -> bool:
+    """
+    Read the CI_FAST_FAIL environment variable.
+
+    Returns:
+        True if it is set to 1, true or yes (any case), otherwise False
+    """
+    return os.environ.get('CI_FAST_FAIL', '').strip().lower() in ('1', 'true', 'yes')
+
+
 def main():
     quotes_file = Path(__file__).parent / 'config' / 'stoic_quotes_365_days.json'
 
@@ -91,44 +119,50 @@ def main():
         print(f"Error: Quotes file not found at {quotes_file}")
         sys.exit(1)
 
-    print("Validating quotes database...")
-    print(f"File: {quotes_file}")
-    print()
+    # CI can set CI_FAST_FAIL=1 to stop at the first broken month
+    result = validate_quotes_database(str(quotes_file), fast_fail=fast_fail_from_env())
 
-    result = validate_quotes_database(str(quotes_file))
+    # Collect the report and write it once rather than line by line
+    out = [
+        "Validating quotes database...",
+        f"File: {quotes_file}",
+        "",
+    ]
 
     if result['complete']:
-        print("✓ VALIDATION PASSED")
-        print(f"  Total quotes: {result['total_quotes']}/365")
-        print(f"  All months complete!")
+        out.append("✓ VALIDATION PASSED")
+        out.append(f"  Total quotes: {result['total_quotes']}/{EXPECTED_TOTAL}")
+        out.append("  All months complete!")
+        print("\n".join(out))
         sys.exit(0)
-    else:
-        print("✗ VALIDATION FAILED")
-        print(f"  Total quotes: {result['total_quotes']}/365")
-        print()
-
-        if result['missing_days']:
-            print(f"  Missing days ({len(result['missing_days'])}):")
-            for month, day in result['missing_days'][:10]:  # Show first 10
-                print(f"    - {month.title()} {day}")
-            if len(result['missing_days']) > 10:
-                print(f"    ... and {len(result['missing_days']) - 10} more")
-            print()
-
-        if result['duplicate_days']:
-            print(f"  Duplicate days ({len(result['duplicate_days'])}):")
-            for month, day in result['duplicate_days']:
-                print(f"    - {month.title()} {day}")
-            print()
-
-        if result['missing_fields']:
-            print(f"  Missing fields ({len(result['missing_fields'])}):")
-            for month, day, field in result['missing_fields'][:10]:
-                print(f"    - {month.title()} {day}: missing '{field}'")
-            if len(result['missing_fields']) > 10:
-                print(f"    ... and {len(result['missing_fields']) - 10} more")
 
-        sys.exit(1)
+    out.append("✗ VALIDATION FAILED")
+    out.append(f"  Total quotes: {result['total_quotes']}/{EXPECTED_TOTAL}")
+    out.append("")
+
+    if result['missing_days']:
+        out.append(f"  Missing days ({len(result['missing_days'])}):")
+        for month, day in result['missing_days'][:10]:  # Show first 10
+            out.append(f"    - {month.title()} {day}")
+        if len(result['missing_days']) > 10:
+            out.append(f"    ... and {len(result['missing_days']) - 10} more")
+        out.append("")
+
+    if result['duplicate_days']:
+        out.append(f"  Duplicate days ({len(result['duplicate_days'])}):")
+        for month, day in result['duplicate_days']:
+            out.append(f"    - {month.title()} {day}")
+        out.append("")
+
+    if result['missing_fields']:
+        out.append(f"  Missing fields ({len(result['missing_fields'])}):")
+        for month, day, field in result['missing_fields'][:10]:
+            out.append(f"    - {month.title()} {day}: missing '{field}'")
+        if len(result['missing_fields']) > 10:
+            out.append(f"    ... and {len(result['missing_fields']) - 10} more")
+
+    print("\n".join(out))
+    sys.exit(1)
 
 
 if __name__ == '__main__':